@@ -1,7 +1,14 @@
+import re
+from functools import lru_cache
 from uuid import UUID
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-ADJECTIVES = [
+
+class AmbiguousAliasError(ValueError):
+    """Raised when an alias is shared by several tasks and cannot pick one."""
+
+
+ADJECTIVES = (
     "Ancient",
     "Blue",
     "Cosmic",
@@ -42,9 +49,9 @@ ADJECTIVES = [
     "Sharp",
     "Tough",
     "Vivid",
-]
+)
 
-NOUNS = [
+NOUNS = (
     "Bear",
     "Cat",
     "Dog",
@@ -85,47 +92,96 @@ NOUNS = [
     "Note",
     "Ocean",
     "Path",
-]
+)
+
+_N_ADJ = len(ADJECTIVES)
+_N_NOUN = len(NOUNS)
+
+# Every possible alias, precomputed once and indexed by adj_idx * _N_NOUN + noun_idx
+_ALIAS_TABLE = tuple(f"{a}-{n}" for a in ADJECTIVES for n in NOUNS)
+_ALIAS_TABLE_LOWER = tuple(a.lower() for a in _ALIAS_TABLE)
+
+# Lowercase alias -> position in the tables, for case-insensitive matching
+_ALIAS_POSITION = {a: i for i, a in enumerate(_ALIAS_TABLE_LOWER)}
 
+# Alias with an optional trailing version suffix, e.g. "misty-rat" or "misty-rat-2"
+_VERSION_RE = re.compile(r"(.+?)(?:-(\d+))?")
 
+
+@lru_cache(maxsize=None)
 def generate_alias(uuid_obj: UUID) -> str:
     """
     Generates a deterministic 'Adjective-Noun' alias from a UUID.
     Uses the first byte for the adjective and the second byte for the noun.
     """
-    # Get bytes
     b = uuid_obj.bytes
+    # The table sizes are fixed at 40, so keep ``%`` rather than masking: padding
+    # the tables to a power of two would change every existing alias.
+    return _ALIAS_TABLE[(b[0] % _N_ADJ) * _N_NOUN + b[1] % _N_NOUN]
+
+
+@lru_cache(maxsize=None)
+def generate_alias_lower(uuid_obj: UUID) -> str:
+    """
+    Same as generate_alias(uuid_obj).lower(), read from the precomputed
+    lowercase table so no mixed-case string is created and lowered.
+    """
+    b = uuid_obj.bytes
+    return _ALIAS_TABLE_LOWER[(b[0] % _N_ADJ) * _N_NOUN + b[1] % _N_NOUN]
 
-    # Use first byte for adjective index
-    adj_idx = b[0] % len(ADJECTIVES)
 
-    # Use second byte for noun index
-    noun_idx = b[1] % len(NOUNS)
+def _split_version(alias: str) -> Tuple[str, Optional[int]]:
+    """
+    Normalizes an alias and splits off an optional version suffix.
+    Returns (lowercase_alias, version_number), e.g. "Misty-Rat-2" -> ("misty-rat", 2).
+    """
+    m = _VERSION_RE.fullmatch(alias.lower())
+    if not m:
+        return "", None
 
-    return f"{ADJECTIVES[adj_idx]}-{NOUNS[noun_idx]}"
+    target, version = m.groups()
+    return target, int(version) if version else None
 
 
-def resolve_alias(alias: str, candidates: List[UUID]) -> Optional[tuple]:
+def resolve_alias(alias: str, candidates: Iterable[UUID]) -> Optional[tuple]:
     """
-    Finds the UUID that corresponds to the given alias from a list of candidates.
+    Finds the UUID that corresponds to the given alias among the candidates (any
+    iterable, e.g. a dict keys view, is scanned lazily without being copied).
     Returns a tuple (UUID, version_number) where version_number is None for current
     version,
     or an integer for a specific historical version (e.g., "Misty-Rat-2" -> (uuid, 2)).
     """
-    # Normalize alias (case-insensitive)
-    target = alias.lower()
-
-    # Check for version suffix (e.g., "Misty-Rat-2")
-    version_number = None
-    if target[-1].isdigit():
-        # Find the last dash before the number
-        parts = target.rsplit("-", 1)
-        if len(parts) == 2 and parts[1].isdigit():
-            target = parts[0]
-            version_number = int(parts[1])
+    target, version_number = _split_version(alias)
+
+    # Turn the target into table indices once, then compare raw UUID bytes
+    # against them instead of building an alias string per candidate
+    position = _ALIAS_POSITION.get(target)
+    if position is None:
+        return None
+    adj_idx, noun_idx = divmod(position, _N_NOUN)
 
     for cand in candidates:
-        if generate_alias(cand).lower() == target:
+        b = cand.bytes
+        if b[0] % _N_ADJ == adj_idx and b[1] % _N_NOUN == noun_idx:
             return (cand, version_number)
 
     return None
+
+
+def lookup_alias(alias: str, index: Dict[str, List[UUID]]) -> Optional[tuple]:
+    """
+    Same as resolve_alias, but uses a prebuilt index mapping lowercase aliases to
+    the UUIDs that share them (see TodoTracker.alias_index) instead of scanning.
+    Raises AmbiguousAliasError when several UUIDs share the alias, since there
+    are only 1600 aliases and silently picking one could act on the wrong task.
+    """
+    target, version_number = _split_version(alias)
+
+    uuids = index.get(target)
+    if uuids:
+        if len(uuids) > 1:
+            matches = ", ".join(str(u) for u in uuids)
+            raise AmbiguousAliasError(f"Alias '{alias}' matches several tasks ({matches}); use the full UUID")
+        return (uuids[0], version_number)
+
+    return None
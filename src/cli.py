@@ -1,24 +1,74 @@
 #!/usr/bin/env python3
 import argparse
+import shlex
 import sys
 import json
 import logging
+from collections import defaultdict
 from uuid import UUID
-from datetime import datetime
 
 # Add src to path if running directly
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.tracker import TodoTracker  # noqa: E402
-from src.alias import generate_alias, resolve_alias  # noqa: E402
+from src.alias import generate_alias, lookup_alias  # noqa: E402
+from src import jsonio  # noqa: E402
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 
+def _tracker_class():
+    """
+    Returns the TodoTracker class, importing it on first use.
+    The tracker pulls in pydantic and the storage layer, which --help and
+    argument errors never need.
+    """
+    if "TodoTracker" not in globals():
+        from src.tracker import TodoTracker
+
+        globals()["TodoTracker"] = TodoTracker
+    return globals()["TodoTracker"]
+
+
+def __getattr__(name):
+    # Keep src.cli.TodoTracker available (and patchable) despite the lazy import
+    if name == "TodoTracker":
+        return _tracker_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Layout of format_task(full=True); attachment lines are appended after it
+_FULL_TEMPLATE = (
+    "ID:          {id} ({alias})\n"
+    "Description: {description}\n"
+    "Status:      {status}\n"
+    "Created:     {created}\n"
+    "Modified:    {modified}\n"
+    "Deadline:    {deadline}\n"
+    "ID (hash):   {version_hash}\n"
+    "Parent:      {parent}\n"
+    "Attachments:"
+)
+
+
+def _first_line(text):
+    """Returns the first line of text, as text.splitlines()[0] would."""
+    line = text.partition("\n")[0]
+    # Only control characters (\r, \x0b, \u2028, ...) can be other line breaks
+    if not line.isprintable():
+        lines = line.splitlines()
+        line = lines[0] if lines else ""
+    return line
+
+
+def _short_timestamp(dt):
+    """Formats a datetime as YYYY-MM-DD HH:MM without going through strftime."""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+
+
 def format_task(task, full=False):
     if not task:
         return "Task not found."
@@ -28,30 +78,37 @@ def format_task(task, full=False):
         task_id = f"{str(task.id)[:6]} ({alias})"
 
         # Format modified_at timestamp (just date and time, no microseconds)
-        modified_str = task.modified_at.strftime("%Y-%m-%d %H:%M")
+        modified_str = _short_timestamp(task.modified_at)
+        first_line = _first_line(task.description)
 
         if task.attachments:
-            return (
-                f"{task_id:<20} @ | {task.status.ljust(10)} | {modified_str:<16} | " f"{task.description.splitlines()[0]:<22}"
-            )
+            return f"{task_id:<20} @ | {task.status.ljust(10)} | {modified_str:<16} | " f"{first_line:<22}"
         else:
-            return f"{task_id:<22} | {task.status.ljust(10)} | {modified_str:<16} | " f"{task.description.splitlines()[0]:<22}"
-
-    lines = [
-        f"ID:          {task.id} ({alias})",
-        f"Description: {task.description}",
-        f"Status:      {task.status}",
-        f"Created:     {task.created_at}",
-        f"Modified:    {task.modified_at}",
-        f"Deadline:    {task.deadline}",
-        f"ID (hash):   {task.version_hash}",
-        f"Parent:      {task.parent}",
-        "Attachments:",
-    ]
-    for att in task.attachments:
-        lines.append(f"  - {att.filename} (Hash: {att.content_hash})")
-
-    return "\n".join(lines)
+            return f"{task_id:<22} | {task.status.ljust(10)} | {modified_str:<16} | " f"{first_line:<22}"
+
+    details = _FULL_TEMPLATE.format(
+        id=task.id,
+        alias=alias,
+        description=task.description,
+        status=task.status,
+        created=task.created_at,
+        modified=task.modified_at,
+        deadline=task.deadline,
+        version_hash=task.version_hash,
+        parent=task.parent,
+    )
+    if not task.attachments:
+        return details
+
+    return details + "\n" + "\n".join(f"  - {att.filename} (Hash: {att.content_hash})" for att in task.attachments)
+
+
+def _looks_like_uuid(id_str):
+    """
+    Cheap pre-check so alias inputs skip the UUID() parse and its exception.
+    A UUID needs at least 32 hex digits, far longer than any alias.
+    """
+    return len(id_str) >= 32
 
 
 def get_task_id(orch, id_str, allow_version=False):
@@ -59,88 +116,89 @@ def get_task_id(orch, id_str, allow_version=False):
     Resolves an ID string to a Task object.
     If allow_version=True, supports versioned aliases like "Misty-Rat-2".
     Returns a Task object (either current or historical version).
+    Raises ValueError (AmbiguousAliasError if the alias is shared) when the
+    input cannot be resolved; handlers print the message.
     """
-    try:
-        # Try parsing as UUID
-        task_id = UUID(id_str)
-        return orch.get_task(task_id)
-    except ValueError:
-        # Try as alias
-        candidates = list(orch.tasks.keys())
-        resolved = resolve_alias(id_str, candidates)
-        if resolved:
-            uuid, version = resolved
-            if version is not None and allow_version:
-                # Get specific version
-                return orch.get_task_version(uuid, version)
-            else:
-                # Get current version
-                return orch.get_task(uuid)
-        raise ValueError("Invalid UUID or Alias")
+    if _looks_like_uuid(id_str):
+        try:
+            # Try parsing as UUID
+            task_id = UUID(id_str)
+            return orch.get_task(task_id)
+        except ValueError:
+            pass
+
+    # Try as alias
+    resolved = lookup_alias(id_str, orch.alias_index)
+    if resolved:
+        uuid, version = resolved
+        if version is not None and allow_version:
+            # Get specific version
+            return orch.get_task_version(uuid, version)
+        else:
+            # Get current version
+            return orch.get_task(uuid)
+    raise ValueError("Invalid UUID or Alias")
 
 
 def render_kanban_board(tasks_by_status, statuses):
     """Renders tasks in a kanban board layout with ASCII box-drawing characters."""
     COL_WIDTH = 22
+    blank = " " * COL_WIDTH
 
-    # Prepare columns
+    # Prepare columns of cells already padded (and truncated) to the column width
     columns = []
     for status in statuses:
-        tasks = tasks_by_status.get(status, [])
         col_data = []
-        for task in tasks:
-            alias = generate_alias(task.id)
-            # Truncate description
-            desc = task.description[: COL_WIDTH - 2] if len(task.description) > COL_WIDTH - 2 else task.description
-            col_data.append(f"{desc}")
-            col_data.append(f"({alias})")
-            col_data.append("")  # Spacing
+        for task in tasks_by_status.get(status, []):
+            # Descriptions leave a little room inside the cell
+            col_data.append(task.description[: COL_WIDTH - 2].ljust(COL_WIDTH))
+            col_data.append(f"({generate_alias(task.id)})"[:COL_WIDTH].ljust(COL_WIDTH))
+            col_data.append(blank)  # Spacing
         columns.append(col_data)
 
-    # Find max rows
-    max_rows = max(len(col) for col in columns) if columns else 0
-
     # Pad columns to same height
+    max_rows = max(len(col) for col in columns) if columns else 0
     for col in columns:
-        while len(col) < max_rows:
-            col.append("")
+        col.extend([blank] * (max_rows - len(col)))
 
-    # Build output
-    output = []
-
-    # Top border
-    top = "┌" + "┬".join(["─" * COL_WIDTH for _ in statuses]) + "┐"
-    output.append(top)
-
-    # Headers
+    rule = "─" * COL_WIDTH
     header_cells = [status.upper().center(COL_WIDTH)[:COL_WIDTH] for status in statuses]
-    output.append("│" + "│".join(header_cells) + "│")
-
-    # Header separator
-    sep = "├" + "┼".join(["─" * COL_WIDTH for _ in statuses]) + "┤"
-    output.append(sep)
-
-    # Rows
-    for row_idx in range(max_rows):
-        row_cells = []
-        for col in columns:
-            cell = col[row_idx] if row_idx < len(col) else ""
-            row_cells.append(cell.ljust(COL_WIDTH)[:COL_WIDTH])
-        output.append("│" + "│".join(row_cells) + "│")
-
-    # Bottom border
-    bottom = "└" + "┴".join(["─" * COL_WIDTH for _ in statuses]) + "┘"
-    output.append(bottom)
+    output = [
+        "┌" + "┬".join([rule] * len(statuses)) + "┐",
+        "│" + "│".join(header_cells) + "│",
+        "├" + "┼".join([rule] * len(statuses)) + "┤",
+    ]
+    output.extend("│" + "│".join(row) + "│" for row in zip(*columns))
+    output.append("└" + "┴".join([rule] * len(statuses)) + "┘")
 
     return "\n".join(output)
 
 
 # --- Command Handlers ---
 
+COMMANDS = (
+    "add",
+    "list",
+    "show",
+    "update",
+    "attach",
+    "extract",
+    "duplicate",
+    "kanban",
+    "archive",
+    "unarchive",
+    "delete",
+    "dump",
+    "history",
+    "batch",
+)
+
 
 def handle_add(orch, args):
     deadline = None
     if args.deadline:
+        from datetime import datetime
+
         try:
             deadline = datetime.strptime(args.deadline, "%Y-%m-%d")
         except ValueError:
@@ -155,12 +213,14 @@ def handle_list(orch, args):
     if not orch.tasks:
         print("No tasks found.")
     else:
-        print(f"{'ID (ALIAS)':<22} | {'STATUS':<10} | {'MODIFIED':<16} | DESCRIPTION")
-        print("-" * 100)
+        # Build all rows and emit them with a single write
+        rows = [f"{'ID (ALIAS)':<22} | {'STATUS':<10} | {'MODIFIED':<16} | DESCRIPTION", "-" * 100]
         for task in orch.tasks.values():
             if not args.all and task.archived:
                 continue
-            print(format_task(task))
+            rows.append(format_task(task))
+        rows.append("")
+        sys.stdout.write("\n".join(rows))
 
 
 def handle_show(orch, args):
@@ -170,8 +230,8 @@ def handle_show(orch, args):
             print(format_task(task, full=True))
         else:
             print("Task not found.")
-    except ValueError:
-        print("Invalid UUID or Alias")
+    except ValueError as e:
+        print(e)
 
 
 def handle_update(orch, args):
@@ -187,6 +247,8 @@ def handle_update(orch, args):
         if args.status:
             updates["status"] = args.status
         if args.deadline:
+            from datetime import datetime
+
             try:
                 deadline = datetime.strptime(args.deadline, "%Y-%m-%d")
                 updates["deadline"] = deadline
@@ -203,8 +265,8 @@ def handle_update(orch, args):
                 print("Task not found.")
         else:
             print("No updates provided.")
-    except ValueError:
-        print("Invalid UUID or Alias")
+    except ValueError as e:
+        print(e)
 
 
 def handle_attach(orch, args):
@@ -220,8 +282,8 @@ def handle_attach(orch, args):
             print(format_task(updated_task, full=True))
         else:
             print("Task not found or file error.")
-    except ValueError:
-        print("Invalid UUID or Alias")
+    except ValueError as e:
+        print(e)
 
 
 def handle_extract(orch, args):
@@ -236,8 +298,8 @@ def handle_extract(orch, args):
             print(f"Attachment '{args.filename}' extracted to '{args.output}'")
         else:
             print("Failed to extract attachment. Check task ID and filename.")
-    except ValueError:
-        print("Invalid UUID or Alias")
+    except ValueError as e:
+        print(e)
 
 
 def handle_duplicate(orch, args):
@@ -255,26 +317,33 @@ def handle_duplicate(orch, args):
             print(format_task(new_task, full=True))
         else:
             print("Failed to duplicate task.")
-    except ValueError:
-        print("Invalid UUID or Alias")
+    except ValueError as e:
+        print(e)
 
 
-def handle_kanban(orch, args):
-    # Group tasks by status (case-insensitive)
-    status_map = {}
-    for status in args.statuses:
-        status_map[status.lower()] = status
+def group_tasks_by_status(tasks, statuses):
+    """
+    Groups unarchived tasks under the given statuses in a single pass.
+    Statuses match case-insensitively; tasks in any other status are left out.
+    """
+    status_map = {status.lower(): status for status in statuses}
+    get_status = status_map.get
 
-    tasks_by_status = {status: [] for status in args.statuses}
+    tasks_by_status = defaultdict(list)
 
-    for task in orch.tasks.values():
+    for task in tasks:
         if task.archived:
             continue
-        task_status_lower = task.status.lower()
-        if task_status_lower in status_map:
-            original_status = status_map[task_status_lower]
+        original_status = get_status(task.status.lower())
+        if original_status is not None:
             tasks_by_status[original_status].append(task)
 
+    return tasks_by_status
+
+
+def handle_kanban(orch, args):
+    tasks_by_status = group_tasks_by_status(orch.tasks.values(), args.statuses)
+
     # Render and display
     board = render_kanban_board(tasks_by_status, args.statuses)
     print(board)
@@ -292,8 +361,8 @@ def handle_archive(orch, args):
             print(f"Task {task.id} archived.")
         else:
             print("Failed to archive task.")
-    except ValueError:
-        print("Invalid UUID or Alias")
+    except ValueError as e:
+        print(e)
 
 
 def handle_unarchive(orch, args):
@@ -308,8 +377,8 @@ def handle_unarchive(orch, args):
             print(f"Task {task.id} unarchived.")
         else:
             print("Failed to unarchive task.")
-    except ValueError:
-        print("Invalid UUID or Alias")
+    except ValueError as e:
+        print(e)
 
 
 def handle_delete(orch, args):
@@ -324,34 +393,46 @@ def handle_delete(orch, args):
             print(f"Task {task.id} deleted.")
         else:
             print("Failed to delete task.")
-    except ValueError:
-        print("Invalid UUID or Alias")
+    except ValueError as e:
+        print(e)
 
 
-def handle_dump(orch, args):
-    tasks_to_dump = []
+def iter_dump_entries(orch, args):
+    """Yields the task versions selected by the dump flags, one at a time."""
+    if args.history:
+        for _, history in orch.iter_all_history(include_archived=args.all):
+            yield from history
+        return
+
     for task in orch.tasks.values():
         if not args.all and task.archived:
             continue
+        yield task
 
-        if args.history:
-            history = orch.get_history(task.id)
-            for version in history:
-                tasks_to_dump.append(version.model_dump(mode="json"))
-        else:
-            tasks_to_dump.append(task.model_dump(mode="json"))
 
-    json_output = json.dumps(tasks_to_dump, indent=2, default=str)
+def _task_json(task):
+    """
+    Serializes a task as indented JSON. json.dumps escapes non-ASCII text, so
+    the dump can be written to any stream encoding.
+    """
+    return json.dumps(task.model_dump(mode="json"), indent=2, default=str)
+
+
+def handle_dump(orch, args):
+    # Entries are serialized and written one by one rather than building the
+    # whole document in memory first
+    entries = iter_dump_entries(orch, args)
 
     if args.output:
         try:
-            with open(args.output, "w") as f:
-                f.write(json_output)
-            print(f"Dumped {len(tasks_to_dump)} tasks to {args.output}")
+            with open(args.output, "w", encoding="utf-8") as f:
+                count = jsonio.dump_pretty_array(entries, f, serialize=_task_json)
+            print(f"Dumped {count} tasks to {args.output}")
         except IOError as e:
             print(f"Error writing to file: {e}")
     else:
-        print(json_output)
+        jsonio.dump_pretty_array(entries, sys.stdout, serialize=_task_json)
+        sys.stdout.write("\n")
 
 
 def handle_history(orch, args):
@@ -365,82 +446,148 @@ def handle_history(orch, args):
         if not history:
             print("Task not found.")
         else:
+            # Build all versions and emit them with a single write
+            blocks = []
             for i, task_version in enumerate(history):
-                print(f"--- Version {len(history) - i} ---")
-                print(format_task(task_version, full=True))
-                print("")
-    except ValueError:
-        print("Invalid UUID or Alias")
+                blocks.append(f"--- Version {len(history) - i} ---\n{format_task(task_version, full=True)}\n\n")
+            sys.stdout.write("".join(blocks))
+    except ValueError as e:
+        print(e)
 
 
-def main():
+def handle_batch(orch, parser):
+    """
+    Runs newline-delimited commands from stdin against a single tracker.
+    A line that cannot be run is reported and skipped; the batch still exits
+    with status 1 at the end, so scripted callers can detect the failure.
+    """
+    failed = False
+    for line in sys.stdin:
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as e:
+            print(f"Invalid command line: {e}")
+            failed = True
+            continue
+        if not argv:
+            continue
+
+        try:
+            args = parser.parse_args(argv)
+        except SystemExit as e:
+            # argparse has already reported the problem; carry on with the next line
+            if e.code:
+                failed = True
+            continue
+
+        if args.command == "batch":
+            print("Nested batch commands are not supported.")
+            failed = True
+            continue
+
+        dispatch(orch, args, parser)
+
+    if failed:
+        sys.exit(1)
+
+
+def build_parser(command=None):
+    """
+    Builds the CLI argument parser.
+    If command names a known subcommand, only that subparser is constructed,
+    sparing the setup cost of all the others on single-command invocations.
+    """
+    if command not in COMMANDS:
+        command = None
+
+    def wanted(name):
+        return command is None or command == name
+
     parser = argparse.ArgumentParser(description="Todo Tracker CLI")
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
     # ADD
-    add_parser = subparsers.add_parser("add", help="Add a new task")
-    add_parser.add_argument("description", help="Task description")
-    add_parser.add_argument("--deadline", help="Deadline (YYYY-MM-DD)")
+    if wanted("add"):
+        add_parser = subparsers.add_parser("add", help="Add a new task")
+        add_parser.add_argument("description", help="Task description")
+        add_parser.add_argument("--deadline", help="Deadline (YYYY-MM-DD)")
 
     # LIST
-    list_parser = subparsers.add_parser("list", help="List all tasks")
-    list_parser.add_argument("-a", "--all", action="store_true", help="Show all tasks including archived")
+    if wanted("list"):
+        list_parser = subparsers.add_parser("list", help="List all tasks")
+        list_parser.add_argument("-a", "--all", action="store_true", help="Show all tasks including archived")
 
     # SHOW
-    show_parser = subparsers.add_parser("show", help="Show task details")
-    show_parser.add_argument("id", help="Task UUID")
+    if wanted("show"):
+        show_parser = subparsers.add_parser("show", help="Show task details")
+        show_parser.add_argument("id", help="Task UUID")
 
     # UPDATE
-    update_parser = subparsers.add_parser("update", help="Update a task")
-    update_parser.add_argument("id", help="Task UUID")
-    update_parser.add_argument("--desc", help="New description")
-    update_parser.add_argument("--status", help="New status")
-    update_parser.add_argument("--deadline", help="New deadline (YYYY-MM-DD)")
+    if wanted("update"):
+        update_parser = subparsers.add_parser("update", help="Update a task")
+        update_parser.add_argument("id", help="Task UUID")
+        update_parser.add_argument("--desc", help="New description")
+        update_parser.add_argument("--status", help="New status")
+        update_parser.add_argument("--deadline", help="New deadline (YYYY-MM-DD)")
 
     # ATTACH
-    attach_parser = subparsers.add_parser("attach", help="Attach a file to a task")
-    attach_parser.add_argument("id", help="Task UUID")
-    attach_parser.add_argument("filepath", help="Path to file")
+    if wanted("attach"):
+        attach_parser = subparsers.add_parser("attach", help="Attach a file to a task")
+        attach_parser.add_argument("id", help="Task UUID")
+        attach_parser.add_argument("filepath", help="Path to file")
 
     # EXTRACT
-    extract_parser = subparsers.add_parser("extract", help="Extract an attachment from a task")
-    extract_parser.add_argument("id", help="Task UUID or Alias")
-    extract_parser.add_argument("filename", help="Attachment filename")
-    extract_parser.add_argument("--output", required=True, help="Output path")
+    if wanted("extract"):
+        extract_parser = subparsers.add_parser("extract", help="Extract an attachment from a task")
+        extract_parser.add_argument("id", help="Task UUID or Alias")
+        extract_parser.add_argument("filename", help="Attachment filename")
+        extract_parser.add_argument("--output", required=True, help="Output path")
 
     # DUPLICATE
-    duplicate_parser = subparsers.add_parser("duplicate", help="Duplicate a task")
-    duplicate_parser.add_argument("id", help="Task UUID or Alias")
+    if wanted("duplicate"):
+        duplicate_parser = subparsers.add_parser("duplicate", help="Duplicate a task")
+        duplicate_parser.add_argument("id", help="Task UUID or Alias")
 
-    kanban_parser = subparsers.add_parser("kanban", help="Display kanban board")
-    kanban_parser.add_argument("statuses", nargs="+", help="Status values to display as columns")
+    # KANBAN
+    if wanted("kanban"):
+        kanban_parser = subparsers.add_parser("kanban", help="Display kanban board")
+        kanban_parser.add_argument("statuses", nargs="+", help="Status values to display as columns")
 
     # ARCHIVE
-    archive_parser = subparsers.add_parser("archive", help="Archive a task")
-    archive_parser.add_argument("id", help="Task UUID or Alias")
+    if wanted("archive"):
+        archive_parser = subparsers.add_parser("archive", help="Archive a task")
+        archive_parser.add_argument("id", help="Task UUID or Alias")
 
     # UNARCHIVE
-    unarchive_parser = subparsers.add_parser("unarchive", help="Unarchive a task")
-    unarchive_parser.add_argument("id", help="Task UUID or Alias")
+    if wanted("unarchive"):
+        unarchive_parser = subparsers.add_parser("unarchive", help="Unarchive a task")
+        unarchive_parser.add_argument("id", help="Task UUID or Alias")
 
     # DELETE
-    delete_parser = subparsers.add_parser("delete", help="Delete a task")
-    delete_parser.add_argument("id", help="Task UUID or Alias")
+    if wanted("delete"):
+        delete_parser = subparsers.add_parser("delete", help="Delete a task")
+        delete_parser.add_argument("id", help="Task UUID or Alias")
 
     # DUMP
-    dump_parser = subparsers.add_parser("dump", help="Dump tasks to JSON")
-    dump_parser.add_argument("-a", "--all", action="store_true", help="Include archived tasks")
-    dump_parser.add_argument("--history", action="store_true", help="Include all versions of tasks")
-    dump_parser.add_argument("--output", help="Output file path")
+    if wanted("dump"):
+        dump_parser = subparsers.add_parser("dump", help="Dump tasks to JSON")
+        dump_parser.add_argument("-a", "--all", action="store_true", help="Include archived tasks")
+        dump_parser.add_argument("--history", action="store_true", help="Include all versions of tasks")
+        dump_parser.add_argument("--output", help="Output file path")
 
     # HISTORY
-    history_parser = subparsers.add_parser("history", help="Show task history")
-    history_parser.add_argument("id", help="Task UUID")
+    if wanted("history"):
+        history_parser = subparsers.add_parser("history", help="Show task history")
+        history_parser.add_argument("id", help="Task UUID")
 
-    args = parser.parse_args()
+    # BATCH
+    if wanted("batch"):
+        subparsers.add_parser("batch", help="Run commands from stdin (one per line) against a single tracker")
 
-    orch = TodoTracker()
+    return parser
 
+
+def dispatch(orch, args, parser):
     handlers = {
         "add": handle_add,
         "list": handle_list,
@@ -463,5 +610,32 @@ def main():
         parser.print_help()
 
 
+def main():
+    try:
+        _run()
+    except BrokenPipeError:
+        # The reader went away (e.g. `todo dump --history | head`). Point stdout
+        # at devnull so the interpreter's final flush does not fail again, and
+        # exit quietly, as the signal module docs recommend
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+
+
+def _run():
+    # Only build the subparser for the requested command; batch lines may use
+    # any command, so it gets the full parser
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    parser = build_parser(None if command == "batch" else command)
+    args = parser.parse_args()
+
+    orch = _tracker_class()()
+
+    if args.command == "batch":
+        handle_batch(orch, parser)
+    else:
+        dispatch(orch, args, parser)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,41 @@
+import json
+from typing import Any, Callable, Iterable, TextIO
+
+try:
+    import orjson
+except ImportError:  # orjson speeds up loads (pip install todo-tracker[fast])
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps_canonical(data: Any) -> bytes:
+    """
+    Serializes data to canonical JSON bytes with sorted keys. This is the format
+    store_json has always written, so existing content hashes stay valid. Values
+    JSON cannot represent are converted with str().
+    """
+    return json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+
+
+def dump_pretty_array(items: Iterable[Any], fp: TextIO, serialize: Callable[[Any], str]) -> int:
+    """
+    Writes items to fp as an indented JSON array, serializing one element at a
+    time so the full document is never held in memory. serialize must render a
+    single item as JSON indented by two spaces. Returns the number of items
+    written.
+    """
+    count = 0
+    for item in items:
+        fp.write("[\n  " if count == 0 else ",\n  ")
+        # JSON text never contains raw newlines inside strings, so this only
+        # re-indents structure
+        fp.write(serialize(item).replace("\n", "\n  "))
+        count += 1
+    fp.write("\n]" if count else "[]")
+    return count
+
+
+def loads(data: bytes) -> Any:
+    """Parses JSON from UTF-8 bytes. Raises json.JSONDecodeError on invalid input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
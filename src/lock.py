@@ -1,4 +1,6 @@
 import fcntl
+import signal
+import threading
 import time
 from contextlib import contextmanager
 
@@ -8,24 +10,86 @@ class FileLock:
         self.lock_file = lock_file
         self.timeout = timeout
         self._fd = None
+        # Re-entrant for the holding thread, so nested acquire() calls (e.g. a
+        # tracker operation inside TodoTracker.batch) do not deadlock on flock
+        self._owner = None
+        self._depth = 0
+
+    def _timeout_error(self) -> TimeoutError:
+        return TimeoutError(f"Could not acquire lock on {self.lock_file} within {self.timeout} seconds")
+
+    def _can_block(self) -> bool:
+        """
+        Whether a blocking flock can be bounded with SIGALRM: signals are only
+        delivered to the main thread, and an alarm someone else armed is left alone.
+        """
+        return (
+            self.timeout > 0
+            and hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+            and signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+        )
+
+    def _flock_blocking(self):
+        """Waits in flock until the lock is released, interrupted after the timeout."""
+
+        def on_alarm(signum, frame):
+            raise self._timeout_error()
+
+        previous = signal.signal(signal.SIGALRM, on_alarm)
+        try:
+            signal.setitimer(signal.ITIMER_REAL, self.timeout)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            # Disarm as soon as the lock is held, so the alarm cannot fire in cleanup
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        finally:
+            try:
+                # Still armed if flock failed; the alarm may fire right here
+                signal.setitimer(signal.ITIMER_REAL, 0)
+            finally:
+                signal.signal(signal.SIGALRM, previous)
+
+    def _flock_polling(self):
+        """Retries a non-blocking flock until the timeout."""
+        start_time = time.time()
+        while True:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except IOError:
+                if time.time() - start_time > self.timeout:
+                    raise self._timeout_error()
+                time.sleep(0.1)
 
     @contextmanager
     def acquire(self):
-        start_time = time.time()
+        if self._depth and self._owner == threading.get_ident():
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+            return
+
         self._fd = open(self.lock_file, "w")
         try:
-            while True:
-                try:
-                    # Try to acquire an exclusive lock (non-blocking)
-                    fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                    break
-                except IOError:
-                    if time.time() - start_time > self.timeout:
-                        raise TimeoutError(f"Could not acquire lock on {self.lock_file} within " f"{self.timeout} seconds")
-                    time.sleep(0.1)
+            try:
+                # Uncontended case: take the lock without waiting
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except IOError:
+                # Block so the lock is taken as soon as it is released, rather than
+                # on the next poll
+                if self._can_block():
+                    self._flock_blocking()
+                else:
+                    self._flock_polling()
 
+            self._owner = threading.get_ident()
+            self._depth = 1
             yield
         finally:
+            self._owner = None
+            self._depth = 0
             # Unlock and close
             if self._fd:
                 fcntl.flock(self._fd, fcntl.LOCK_UN)
@@ -1,8 +1,19 @@
 import hashlib
-import json
 import os
-from typing import Any, Dict, Optional
-from uuid import UUID
+import shutil
+from typing import Any, BinaryIO, Dict, Optional, Set
+from uuid import UUID, uuid4
+
+from . import jsonio
+
+# Read size used when streaming files into the store
+CHUNK_SIZE = 1 << 20
+
+# Bytes asked for per read of a ref file, comfortably above a hex SHA-256
+REF_READ_SIZE = 128
+
+# Objects and refs are opened with os.open; keep Windows from translating line endings
+_O_BINARY = getattr(os, "O_BINARY", 0)
 
 
 class ObjectStore:
@@ -10,68 +21,224 @@ class ObjectStore:
         self.root_dir = root_dir
         self.objects_dir = os.path.join(root_dir, "objects")
         self.refs_dir = os.path.join(root_dir, "refs")
+        # Directory prefixes ending in a separator, so object and ref paths can be
+        # built by concatenation instead of os.path.join on every call
+        self._objects_prefix = os.path.join(self.objects_dir, "")
+        self._refs_prefix = os.path.join(self.refs_dir, "")
+        # Shard directories known to exist, to skip repeated makedirs calls
+        self._shards: Set[str] = set()
         self._init_storage()
 
     def _init_storage(self):
         os.makedirs(self.objects_dir, exist_ok=True)
         os.makedirs(self.refs_dir, exist_ok=True)
+        self._migrate_flat_objects()
+
+    def _migrate_flat_objects(self):
+        """Moves objects from the legacy flat objects/<hash> layout into shards."""
+        with os.scandir(self.objects_dir) as entries:
+            legacy = [e.name for e in entries if e.is_file() and not e.name.startswith(".")]
+        for content_hash in legacy:
+            try:
+                os.replace(os.path.join(self.objects_dir, content_hash), self._writable_path(content_hash))
+            except FileNotFoundError:
+                # Another process opening the same store moved it first
+                pass
+
+    def _path_for(self, content_hash: str) -> str:
+        """
+        Returns the path of an object. Objects are fanned out Git-style into
+        objects/<first two hex chars>/<rest>, keeping each directory small.
+        """
+        return self._objects_prefix + content_hash[:2] + os.sep + content_hash[2:]
+
+    def _writable_path(self, content_hash: str) -> str:
+        """Same as _path_for, creating the shard directory if needed."""
+        shard = content_hash[:2]
+        if shard not in self._shards:
+            os.makedirs(self._objects_prefix + shard, exist_ok=True)
+            self._shards.add(shard)
+        return self._path_for(content_hash)
 
     def _compute_hash(self, data: bytes) -> str:
         return hashlib.sha256(data).hexdigest()
 
+    def _write_object(self, content_hash: str, data: bytes):
+        """
+        Writes an object unless it already exists. The bytes go to a temp file that
+        is then hard-linked under the object's name, so readers never see a partial
+        object. os.link never replaces an existing file: when concurrent writers
+        store the same bytes, the first complete copy wins and the rest are dedup
+        hits.
+        """
+        path = self._writable_path(content_hash)
+        if os.path.exists(path):
+            # Objects are content-addressed, so it already holds these bytes
+            return
+        tmp_path = self._objects_prefix + f".tmp-{uuid4().hex}"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_BINARY, 0o666)
+            try:
+                # Unbuffered: the bytes are already in memory, so skip the file object
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view) :]
+            finally:
+                os.close(fd)
+            try:
+                os.link(tmp_path, path)
+            except FileExistsError:
+                # Another writer stored the same bytes first
+                pass
+            except OSError:
+                # No hard links on this filesystem; a rename is still atomic, and
+                # replacing an object only ever swaps in identical bytes
+                os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
     def store_blob(self, data: bytes) -> str:
-        """Stores raw binary data and returns its hash."""
+        """
+        Stores raw binary data and returns its hash. The data is already in memory,
+        so it is hashed first: an object that is already stored is never rewritten.
+        """
         content_hash = self._compute_hash(data)
-        path = os.path.join(self.objects_dir, content_hash)
-        if not os.path.exists(path):
-            with open(path, "wb") as f:
-                f.write(data)
+        self._write_object(content_hash, data)
+        return content_hash
+
+    def store_blob_from_path(self, file_path: str) -> str:
+        """
+        Streams a file into storage and returns its hash.
+        Raises FileNotFoundError if it is missing.
+        """
+        with open(file_path, "rb") as src:
+            return self.store_blob_from_file(src)
+
+    def store_blob_from_file(self, src: BinaryIO) -> str:
+        """
+        Streams a readable binary file object into storage and returns its hash.
+        Each chunk is hashed and copied in the same pass, CHUNK_SIZE at a time, so
+        memory use stays constant regardless of size.
+        """
+        hasher = hashlib.sha256()
+        # Unique temp name in the same directory so the final rename is atomic
+        tmp_path = os.path.join(self.objects_dir, f".tmp-{uuid4().hex}")
+        try:
+            with open(tmp_path, "xb") as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+                    dst.write(chunk)
+
+            content_hash = hasher.hexdigest()
+            path = self._writable_path(content_hash)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                # Atomic: readers never see a partially written object
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
         return content_hash
 
     def store_json(self, data: Dict[str, Any]) -> str:
         """Stores a dictionary as canonical JSON and returns its hash."""
         # Sort keys to ensure canonical representation
-        json_bytes = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+        json_bytes = jsonio.dumps_canonical(data)
         content_hash = self._compute_hash(json_bytes)
-        path = os.path.join(self.objects_dir, content_hash)
-        if not os.path.exists(path):
-            with open(path, "wb") as f:
-                f.write(json_bytes)
+        self._write_object(content_hash, json_bytes)
         return content_hash
 
     def get_object(self, content_hash: str) -> Optional[bytes]:
         """Retrieves raw object data by hash."""
-        path = os.path.join(self.objects_dir, content_hash)
-        if os.path.exists(path):
-            with open(path, "rb") as f:
-                return f.read()
-        return None
+        try:
+            fd = os.open(self._path_for(content_hash), os.O_RDONLY | _O_BINARY)
+        except FileNotFoundError:
+            return None
+        try:
+            # Objects never change once written, so their size says how much to
+            # read; a single unbuffered read avoids a buffered reader per call
+            size = os.fstat(fd).st_size
+            data = os.read(fd, size)
+            if len(data) < size:
+                # Short read (the OS caps a single read), finish in a loop
+                chunks = [data]
+                while True:
+                    chunk = os.read(fd, CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                data = b"".join(chunks)
+            return data
+        finally:
+            os.close(fd)
+
+    def copy_object(self, content_hash: str, dest_path: str) -> bool:
+        """
+        Copies an object's bytes to dest_path, overwriting it. shutil.copyfile
+        copies in the kernel where it can (sendfile on Linux, fcopyfile on macOS),
+        so large blobs are never held in memory. Returns False if the object or the
+        destination directory does not exist.
+        """
+        try:
+            shutil.copyfile(self._path_for(content_hash), dest_path)
+            return True
+        except FileNotFoundError:
+            return False
 
     def get_json(self, content_hash: str) -> Optional[Dict[str, Any]]:
         """Retrieves and parses a JSON object by hash."""
         data = self.get_object(content_hash)
         if data:
-            return json.loads(data.decode("utf-8"))
+            return jsonio.loads(data)
         return None
 
     def update_ref(self, task_id: UUID, content_hash: str):
-        """Updates the reference (HEAD) for a task to point to a new hash."""
-        path = os.path.join(self.refs_dir, str(task_id))
-        with open(path, "w") as f:
-            f.write(content_hash)
+        """
+        Updates the reference (HEAD) for a task to point to a new hash.
+        The new ref is written beside the old one and renamed over it, so readers
+        in other processes see either the old head or the new one, never a
+        truncated file.
+        """
+        tmp_path = self._refs_prefix + f".tmp-{uuid4().hex}"
+        data = content_hash.encode("utf-8")
+        try:
+            # No fsync: the rename is relied on for atomicity, not durability
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_BINARY, 0o666)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view) :]
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, self._refs_prefix + str(task_id))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
     def get_ref(self, task_id: UUID) -> Optional[str]:
         """Gets the current hash for a task."""
-        path = os.path.join(self.refs_dir, str(task_id))
-        if os.path.exists(path):
-            with open(path, "r") as f:
-                return f.read().strip()
-        return None
+        try:
+            fd = os.open(self._refs_prefix + str(task_id), os.O_RDONLY | _O_BINARY)
+        except FileNotFoundError:
+            return None
+        try:
+            # A ref is one short ASCII hash; reading it unbuffered costs a fraction
+            # of a text-mode open
+            chunks = [os.read(fd, REF_READ_SIZE)]
+            while len(chunks[-1]) == REF_READ_SIZE:
+                chunks.append(os.read(fd, REF_READ_SIZE))
+            return b"".join(chunks).decode("utf-8").strip()
+        finally:
+            os.close(fd)
 
     def delete_object(self, content_hash: str) -> bool:
         """Deletes an object by hash. Returns True if deleted, False if not found."""
-        path = os.path.join(self.objects_dir, content_hash)
-        if os.path.exists(path):
-            os.remove(path)
+        try:
+            os.remove(self._path_for(content_hash))
             return True
-        return False
+        except FileNotFoundError:
+            return False
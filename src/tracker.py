@@ -1,17 +1,41 @@
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 from .models import Task, Attachment
 from .storage import ObjectStore
+from .alias import generate_alias_lower
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Stores with at least this many tasks read their heads with a thread pool
+PARALLEL_LOAD_THRESHOLD = 64
+
+# Number of parsed task versions kept in memory, keyed by version hash
+VERSION_CACHE_SIZE = 512
+
+# Number of full histories kept in memory, keyed by the head version hash
+HISTORY_CACHE_SIZE = 128
+
 
 class TodoTracker:
     def __init__(self, root_dir: str = ".todo_store"):
         self.storage = ObjectStore(root_dir=root_dir)
-        self.tasks: Dict[UUID, Task] = {}
+        # Task heads are only read from storage once something needs the full set
+        # (see the tasks and alias_index properties)
+        self._tasks: Dict[UUID, Task] = {}
+        # Lowercase alias -> UUIDs sharing it, for O(1) alias resolution
+        self._alias_index: Dict[str, List[UUID]] = {}
+        self._loaded = False
+        # Versions are immutable once stored, so parsed ones can be reused freely
+        self._version_cache: "OrderedDict[str, Task]" = OrderedDict()
+        # A head hash pins its whole parent chain, so histories never go stale
+        # either; a new commit simply gives the task a new key
+        self._history_cache: "OrderedDict[str, List[Task]]" = OrderedDict()
+        # Ref updates deferred by batch(), task id -> head hash
+        self._pending_refs: Optional[Dict[UUID, str]] = None
 
         # Initialize lock
         from .lock import FileLock
@@ -20,50 +44,190 @@ class TodoTracker:
         lock_path = os.path.join(root_dir, "tracker.lock")
         self.lock = FileLock(lock_path)
 
-        self._load_state()
+    @property
+    def tasks(self) -> Dict[UUID, Task]:
+        """All current tasks by id, loaded from storage on first access."""
+        self._ensure_loaded()
+        return self._tasks
+
+    @property
+    def alias_index(self) -> Dict[str, List[UUID]]:
+        """Lowercase alias -> UUIDs sharing it, loaded on first access."""
+        self._ensure_loaded()
+        return self._alias_index
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            # The load scans refs/, so deferred refs must be on disk first
+            self._flush_refs()
+            self._loaded = True
+            self._load_state()
+
+    def reload(self):
+        """
+        Drops the in-memory task set so the next access re-reads it from storage,
+        picking up changes made by other trackers on the same store. Parsed
+        versions and histories are keyed by content hash and stay valid.
+        """
+        self._flush_refs()
+        self._tasks = {}
+        self._alias_index = {}
+        self._loaded = False
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups several operations under one lock acquisition. Ref files are
+        written once per task when the batch ends rather than on every commit,
+        so repeated updates to a task only rewrite its ref once. A batch is not
+        a transaction: if the body raises, the operations that completed before
+        the error are still written.
+        """
+        if self._pending_refs is not None:
+            # Already batching; the outer batch flushes
+            yield
+            return
+        with self.lock.acquire():
+            self._pending_refs = {}
+            try:
+                yield
+            finally:
+                self._flush_refs()
+                self._pending_refs = None
+
+    def _flush_refs(self):
+        """Writes any ref updates deferred by batch()."""
+        if self._pending_refs:
+            for task_id, head_hash in self._pending_refs.items():
+                self.storage.update_ref(task_id, head_hash)
+            self._pending_refs.clear()
 
     def _load_state(self):
         """Reconstructs in-memory state from storage refs."""
-        # In a real app, we might lazily load, but for now let's load all heads
         if not hasattr(self.storage, "refs_dir"):
             return
 
         import os
 
-        if os.path.exists(self.storage.refs_dir):
-            for filename in os.listdir(self.storage.refs_dir):
+        if not os.path.exists(self.storage.refs_dir):
+            return
+
+        task_ids = []
+        with os.scandir(self.storage.refs_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    # A ref update in progress in another process
+                    continue
                 try:
-                    task_id = UUID(filename)
-                    head_hash = self.storage.get_ref(task_id)
-                    if head_hash:
-                        task_data = self.storage.get_json(head_hash)
-                        if task_data:
-                            task = Task(**task_data)
-                            task.version_hash = head_hash
-                            self.tasks[task_id] = task
+                    task_ids.append(UUID(entry.name))
                 except ValueError:
-                    logger.warning(f"Skipping invalid task file: {filename}")
-                    continue
+                    logger.warning(f"Skipping invalid task file: {entry.name}")
+
+        # Reading refs and head objects is I/O bound, so overlap it across threads
+        # once the store is large enough to amortize the pool start-up
+        if len(task_ids) >= PARALLEL_LOAD_THRESHOLD:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+                heads = list(pool.map(self._read_head, task_ids))
+        else:
+            heads = [self._read_head(task_id) for task_id in task_ids]
+
+        for task_id, (head_hash, task_data) in zip(task_ids, heads):
+            task = self._build_task(task_id, head_hash, task_data)
+            if task:
+                self._tasks[task_id] = task
+                self._index_alias(task_id)
+
+    def _head_hash(self, task_id: UUID) -> Optional[str]:
+        """Returns a task's head hash, including a ref deferred by batch()."""
+        head_hash = self._pending_refs.get(task_id) if self._pending_refs else None
+        return head_hash or self.storage.get_ref(task_id)
+
+    def _read_head(self, task_id: UUID, head_hash: Optional[str] = None):
+        """Reads a task's head hash and its raw JSON data from storage."""
+        if not head_hash:
+            head_hash = self._head_hash(task_id)
+        if not head_hash:
+            return head_hash, None
+        try:
+            return head_hash, self.storage.get_json(head_hash)
+        except ValueError:
+            logger.warning(f"Skipping invalid task file: {task_id}")
+            return head_hash, None
+
+    def _build_task(self, task_id: UUID, head_hash: Optional[str], task_data) -> Optional[Task]:
+        """Builds the head Task from its stored data, or None if it is unusable."""
+        if not task_data:
+            return None
+        try:
+            task = Task(**task_data)
+        except ValueError:
+            logger.warning(f"Skipping invalid task file: {task_id}")
+            return None
+        task.version_hash = head_hash
+        return task
+
+    def _cache_version(self, version_hash: str, task: Task):
+        """Remembers a parsed version, evicting the least recently used."""
+        self._version_cache[version_hash] = task
+        self._version_cache.move_to_end(version_hash)
+        if len(self._version_cache) > VERSION_CACHE_SIZE:
+            self._version_cache.popitem(last=False)
+
+    def _get_version(self, version_hash: str) -> Optional[Task]:
+        """Returns the task version stored under a hash, parsing it only once."""
+        task = self._version_cache.get(version_hash)
+        if task is not None:
+            self._version_cache.move_to_end(version_hash)
+            return task
+        data = self.storage.get_json(version_hash)
+        if not data:
+            return None
+        task = Task(**data)
+        task.version_hash = version_hash  # Important for continuity
+        self._cache_version(version_hash, task)
+        return task
+
+    def _index_alias(self, task_id: UUID):
+        """Registers a task's alias in the reverse alias index."""
+        self._alias_index.setdefault(generate_alias_lower(task_id), []).append(task_id)
+
+    def _unindex_alias(self, task_id: UUID):
+        """Removes a task's alias from the reverse alias index."""
+        key = generate_alias_lower(task_id)
+        uuids = self._alias_index.get(key)
+        if uuids and task_id in uuids:
+            uuids.remove(task_id)
+            if not uuids:
+                del self._alias_index[key]
 
     def _commit_task(self, task: Task) -> Task:
         """Saves the task version and updates the ref."""
-        # 1. Serialize task to dict
-        task_data = task.model_dump(mode="json")
+        # 1. Serialize task straight to JSON bytes. Pydantic emits fields in
+        # declaration order, so the bytes are canonical for a given model. The
+        # version hash is the hash of this content, so it cannot be part of it.
+        json_bytes = task.model_dump_json(exclude={"version_hash"}).encode("utf-8")
 
         # 2. Store JSON object
-        version_hash = self.storage.store_json(task_data)
+        version_hash = self.storage.store_blob(json_bytes)
 
-        # 3. Update task with its own version hash (in memory only, or we'd change the
-        # hash!)
-        # Actually, the hash is of the content. We can store the hash on the object
-        # after saving, but it won't be IN the saved JSON.
+        # 3. Record the task's own version hash (in memory only)
         task.version_hash = version_hash
+        self._cache_version(version_hash, task)
 
-        # 4. Update Ref
-        self.storage.update_ref(task.id, version_hash)
+        # 4. Update Ref (deferred to the end of the batch, if there is one)
+        if self._pending_refs is not None:
+            self._pending_refs[task.id] = version_hash
+        else:
+            self.storage.update_ref(task.id, version_hash)
 
-        # 5. Update in-memory cache
-        self.tasks[task.id] = task
+        # 5. Update in-memory cache if it has been loaded (aliases derive from the
+        # id, so only new tasks need indexing)
+        if self._loaded:
+            if task.id not in self._tasks:
+                self._index_alias(task.id)
+            self._tasks[task.id] = task
 
         return task
 
@@ -86,7 +250,22 @@ class TodoTracker:
             return self._commit_task(task)
 
     def get_task(self, task_id: UUID) -> Optional[Task]:
-        return self.tasks.get(task_id)
+        if self._loaded:
+            return self._tasks.get(task_id)
+        # Read just this task's head rather than loading the whole store. Versions
+        # never change, so a head parsed before only costs a ref read
+        head_hash = self._head_hash(task_id)
+        if not head_hash:
+            return None
+        task = self._version_cache.get(head_hash)
+        if task is not None:
+            self._version_cache.move_to_end(head_hash)
+            return task
+        _, task_data = self._read_head(task_id, head_hash)
+        task = self._build_task(task_id, head_hash, task_data)
+        if task:
+            self._cache_version(head_hash, task)
+        return task
 
     def update_task(self, task_id: UUID, **updates) -> Optional[Task]:
         with self.lock.acquire():
@@ -139,6 +318,10 @@ class TodoTracker:
                         self.storage.delete_object(content_hash)
 
                 del self.tasks[task_id]
+                self._unindex_alias(task_id)
+                if self._pending_refs:
+                    # A head deferred by batch() would otherwise bring the task back
+                    self._pending_refs.pop(task_id, None)
                 # Remove ref file
                 import os
 
@@ -156,22 +339,22 @@ class TodoTracker:
         """Unarchives a task by setting its archived flag to False."""
         return self.update_task(task_id, archived=False)
 
-    def add_attachment(self, task_id: UUID, file_path: str) -> Optional[Task]:
-        """Reads a file, stores it as a blob, and adds it to the task."""
+    def add_attachment(self, task_id: UUID, file_path: str, **updates) -> Optional[Task]:
+        """
+        Reads a file, stores it as a blob, and adds it to the task.
+        Any other field updates are applied in the same new version, so attaching
+        and editing a task costs one commit rather than one per change.
+        """
         task = self.get_task(task_id)
         if not task:
             return None
 
-        # Read file
+        # Stream the file into a blob
         try:
-            with open(file_path, "rb") as f:
-                content = f.read()
+            content_hash = self.storage.store_blob_from_path(file_path)
         except FileNotFoundError:
             return None
 
-        # Store Blob
-        content_hash = self.storage.store_blob(content)
-
         # Create Attachment object
         import os
 
@@ -180,55 +363,82 @@ class TodoTracker:
 
         # Update Task
         new_attachments = task.attachments + [attachment]
-        return self.update_task(task_id, attachments=new_attachments)
+        return self.update_task(task_id, attachments=new_attachments, **updates)
 
-    def get_history(self, task_id: UUID) -> List[Task]:
-        """Returns the history of a task, newest first."""
-        history = []
-        current_task = self.get_task(task_id)
-
-        while current_task:
-            history.append(current_task)
-            parent_hash = current_task.parent
-            if not parent_hash:
-                break
-
-            # Load parent
-            parent_data = self.storage.get_json(parent_hash)
-            if parent_data:
-                current_task = Task(**parent_data)
-                current_task.version_hash = parent_hash  # Important for continuity
-            else:
+    def get_history(self, task_id: UUID, limit: Optional[int] = None) -> List[Task]:
+        """
+        Returns the history of a task, newest first.
+        If limit is given, only that many of the most recent versions are returned
+        and the rest of the chain is not read.
+        """
+        head = self.get_task(task_id)
+        if not head:
+            return []
+
+        head_hash = head.version_hash
+        if head_hash and head_hash in self._history_cache:
+            self._history_cache.move_to_end(head_hash)
+            return self._history_cache[head_hash][:limit]
+
+        history = self._walk_history(head, limit)
+
+        if limit is not None:
+            # A partial walk, not worth remembering as the task's history
+            return history[:limit]
+        if head_hash:
+            self._history_cache[head_hash] = history
+            if len(self._history_cache) > HISTORY_CACHE_SIZE:
+                self._history_cache.popitem(last=False)
+        return list(history)
+
+    def _walk_history(self, head: Task, limit: Optional[int] = None) -> List[Task]:
+        """Follows a task's parent chain from head, newest first, reading at most limit versions."""
+        history = [head]
+        parent_hash = head.parent
+        while parent_hash and (limit is None or len(history) < limit):
+            task = self._get_version(parent_hash)
+            if not task:
                 break
-
+            history.append(task)
+            parent_hash = task.parent
         return history
 
-    def extract_attachment(self, task_id: UUID, filename: str, output_path: str) -> bool:
-        """Extracts an attachment from a task and saves it to the specified path."""
+    def iter_all_history(self, include_archived: bool = True) -> Iterator[Tuple[UUID, List[Task]]]:
+        """
+        Yields (task_id, history) for every task, each history newest first.
+        Histories are produced one task at a time and are not added to the
+        get_history memo, so an export holds one full history at a time, plus
+        at most VERSION_CACHE_SIZE parsed versions.
+        """
+        for task in list(self.tasks.values()):
+            if not include_archived and task.archived:
+                continue
+            head = self.get_task(task.id)
+            if not head:
+                continue
+            cached = self._history_cache.get(head.version_hash) if head.version_hash else None
+            yield task.id, list(cached) if cached is not None else self._walk_history(head)
+
+    def _find_attachment(self, task_id: UUID, filename: str) -> Optional[Attachment]:
+        """Returns the first attachment of a task with the given filename, if any."""
         task = self.get_task(task_id)
         if not task:
-            return False
+            return None
 
-        # Find attachment by filename
-        attachment = None
         for att in task.attachments:
             if att.filename == filename:
-                attachment = att
-                break
+                return att
+        return None
 
+    def extract_attachment(self, task_id: UUID, filename: str, output_path: str) -> bool:
+        """Extracts an attachment from a task and saves it to the specified path."""
+        attachment = self._find_attachment(task_id, filename)
         if not attachment:
             return False
 
-        # Retrieve blob content
-        content = self.storage.get_object(attachment.content_hash)
-        if not content:
-            return False
-
-        # Write to output path
+        # Copy the blob file straight to the output path, without reading it in
         try:
-            with open(output_path, "wb") as f:
-                f.write(content)
-            return True
+            return self.storage.copy_object(attachment.content_hash, output_path)
         except Exception:
             return False
 
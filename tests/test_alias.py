@@ -1,5 +1,6 @@
 from uuid import UUID
-from src.alias import generate_alias, resolve_alias
+import pytest
+from src.alias import AmbiguousAliasError, generate_alias, generate_alias_lower, lookup_alias, resolve_alias
 
 
 def test_generate_alias_deterministic():
@@ -16,6 +17,31 @@ def test_generate_alias_deterministic():
     assert len(parts[1]) > 0
 
 
+def test_generate_alias_stable_mapping():
+    # Aliases are persisted in users' heads and scripts; the byte -> word mapping
+    # must not change.
+    assert generate_alias(UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592")) == "Iron-Path"
+    assert generate_alias(UUID("c4709ac5-4034-f7bb-27ac-93b3596223f9")) == "Rapid-Island"
+
+
+def test_generate_alias_cached():
+    u1 = UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592")
+    generate_alias(u1)
+    hits = generate_alias.cache_info().hits
+
+    # Equal UUID objects share the cache entry
+    assert generate_alias(UUID(str(u1))) == "Iron-Path"
+    assert generate_alias.cache_info().hits == hits + 1
+
+
+def test_generate_alias_lower_matches():
+    for u in (
+        UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592"),
+        UUID("c4709ac5-4034-f7bb-27ac-93b3596223f9"),
+    ):
+        assert generate_alias_lower(u) == generate_alias(u).lower()
+
+
 def test_generate_alias_different():
     u1 = UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592")
     u2 = UUID("c4709ac5-4034-f7bb-27ac-93b3596223f9")
@@ -70,3 +96,40 @@ def test_resolve_alias_with_version():
     result = resolve_alias(f"{a1.lower()}-3", candidates)
     assert result[0] == u1
     assert result[1] == 3
+
+
+def test_lookup_alias():
+    u1 = UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592")
+    u2 = UUID("c4709ac5-4034-f7bb-27ac-93b3596223f9")
+
+    a1 = generate_alias(u1)
+    index = {a1.lower(): [u1], generate_alias(u2).lower(): [u2]}
+
+    assert lookup_alias(a1, index) == (u1, None)
+    assert lookup_alias(a1.upper(), index) == (u1, None)
+    assert lookup_alias(f"{a1}-2", index) == (u1, 2)
+    assert lookup_alias("Non-Existent", index) is None
+
+
+def test_resolve_alias_empty_string():
+    u1 = UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592")
+    assert resolve_alias("", [u1]) is None
+
+
+def test_resolve_alias_accepts_keys_view():
+    u1 = UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592")
+    tasks = {u1: object()}
+    assert resolve_alias(generate_alias(u1), tasks.keys()) == (u1, None)
+
+
+def test_lookup_alias_ambiguous():
+    # Same first two bytes -> same alias
+    u1 = UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592")
+    u2 = UUID("3077aaaa-3da3-4783-aff7-cbedfd5f5592")
+    assert generate_alias(u1) == generate_alias(u2)
+
+    index = {generate_alias(u1).lower(): [u1, u2]}
+    with pytest.raises(AmbiguousAliasError) as exc_info:
+        lookup_alias(generate_alias(u1), index)
+    assert str(u1) in str(exc_info.value)
+    assert str(u2) in str(exc_info.value)
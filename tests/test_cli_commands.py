@@ -1,4 +1,5 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 from src.cli import (
     handle_add,
@@ -13,35 +14,69 @@ from src.cli import (
     handle_unarchive,
     handle_delete,
     handle_history,
+    build_parser,
 )
 from src.models import Task
+from src.alias import generate_alias
+from src.tracker import TodoTracker
 from uuid import UUID
+from datetime import datetime
+
+pytestmark = pytest.mark.unit
+
+# Prebuilt, read-only tasks for parametrized cases
+SAMPLE_TASK = Task(id=UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592"), description="Sample Task", status="pending")
+PENDING_TASK = Task(description="Pending task", status="pending")
+COMPLETED_TASK = Task(description="Completed task", status="completed")
+ACTIVE_TASK = Task(description="Active task", archived=False)
+ARCHIVED_TASK = Task(description="Archived task", archived=True)
+
+
+@pytest.fixture(scope="module")
+def shared_orch():
+    """One mock orchestrator for the module, reset by mock_orch after each test."""
+    # spec= checks attribute names against TodoTracker at a fraction of the cost
+    # of create_autospec, which introspects every signature
+    return MagicMock(spec=TodoTracker)
 
 
 @pytest.fixture
-def mock_orch():
+def mock_orch(shared_orch):
     """Create a mock orchestrator with sample tasks."""
-    orch = MagicMock()
-    orch.tasks = {}
-    return orch
+    shared_orch.tasks = {}
+    shared_orch.alias_index = {}
+    yield shared_orch
+    # Drop call records and any return_value/side_effect a test configured
+    shared_orch.reset_mock(return_value=True, side_effect=True)
 
 
-@pytest.fixture
+# Session-scoped: tests only read the task, never mutate it
+@pytest.fixture(scope="session")
 def sample_task():
     """Create a sample task for testing."""
-    return Task(
-        id=UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592"),
-        description="Sample Task",
-        status="pending",
-    )
+    return SAMPLE_TASK
+
+
+# Copied into mock_orch.tasks by each test; the tasks themselves are only read
+@pytest.fixture(scope="module")
+def pending_and_completed_tasks():
+    """A pending and a completed task, keyed by id."""
+    return {PENDING_TASK.id: PENDING_TASK, COMPLETED_TASK.id: COMPLETED_TASK}
+
+
+@pytest.fixture
+def patched_get_task_id(sample_task):
+    """Patch get_task_id to resolve every id to sample_task for the whole test."""
+    patcher = patch("src.cli.get_task_id", return_value=sample_task)
+    mock = patcher.start()
+    yield mock
+    patcher.stop()
 
 
 class TestHandleAdd:
     def test_add_simple_task(self, mock_orch, capsys):
         """Test adding a simple task without deadline."""
-        args = MagicMock()
-        args.description = "New task"
-        args.deadline = None
+        args = SimpleNamespace(description="New task", deadline=None)
 
         new_task = Task(description="New task")
         mock_orch.add_task.return_value = new_task
@@ -52,152 +87,118 @@ class TestHandleAdd:
         captured = capsys.readouterr()
         assert "Task created" in captured.out
 
-    def test_add_task_with_deadline(self, mock_orch, capsys):
-        """Test adding a task with a deadline."""
-        args = MagicMock()
-        args.description = "Task with deadline"
-        args.deadline = "2025-12-31"
 
-        new_task = Task(description="Task with deadline")
-        mock_orch.add_task.return_value = new_task
-
-        handle_add(mock_orch, args)
-
-        mock_orch.add_task.assert_called_once()
+# (handler, args, tracker method -> return value, task found, expected output)
+HANDLER_CASES = {
+    "add_with_deadline": (
+        handle_add,
+        {"description": "Task with deadline", "deadline": "2025-12-31"},
+        {"add_task": Task(description="Task with deadline")},
+        True,
+        "Task created",
+    ),
+    "show_existing": (handle_show, {"id": str(SAMPLE_TASK.id)}, {}, True, "Sample Task"),
+    "show_missing": (handle_show, {"id": "nonexistent"}, {}, False, "Task not found"),
+    "update_description": (
+        handle_update,
+        {"id": str(SAMPLE_TASK.id), "desc": "Updated description", "status": None, "deadline": None},
+        {"update_task": Task(id=SAMPLE_TASK.id, description="Updated description")},
+        True,
+        "Task updated",
+    ),
+    "update_status": (
+        handle_update,
+        {"id": str(SAMPLE_TASK.id), "desc": None, "status": "completed", "deadline": None},
+        {"update_task": Task(id=SAMPLE_TASK.id, description="Sample Task", status="completed")},
+        True,
+        "Task updated",
+    ),
+    "update_no_changes": (
+        handle_update,
+        {"id": str(SAMPLE_TASK.id), "desc": None, "status": None, "deadline": None},
+        {},
+        True,
+        "No updates provided",
+    ),
+}
+
+
+class TestHandlerOutput:
+    @pytest.mark.parametrize("handler,args,returns,found,expected", HANDLER_CASES.values(), ids=HANDLER_CASES.keys())
+    def test_handler_prints(self, mock_orch, patched_get_task_id, capsys, handler, args, returns, found, expected):
+        """Test that a handler reports the outcome of the tracker call it makes."""
+        for method, value in returns.items():
+            getattr(mock_orch, method).return_value = value
+        if not found:
+            patched_get_task_id.return_value = None
+
+        handler(mock_orch, SimpleNamespace(**args))
+
+        for method in returns:
+            getattr(mock_orch, method).assert_called_once()
         captured = capsys.readouterr()
-        assert "Task created" in captured.out
+        assert expected in captured.out
 
 
 class TestHandleList:
-    def test_list_all_tasks(self, mock_orch, sample_task, capsys):
-        """Test listing all non-archived tasks."""
-        args = MagicMock()
-        args.status = None
-        args.all = False
-
-        mock_orch.tasks = {sample_task.id: sample_task}
-
-        handle_list(mock_orch, args)
-
-        captured = capsys.readouterr()
-        assert "Sample Task" in captured.out
-
-    def test_list_by_status(self, mock_orch, capsys):
-        """Test listing tasks filtered by status."""
-        args = MagicMock()
-        args.status = "completed"
-        args.all = False
-
-        task1 = Task(description="Pending task", status="pending")
-        task2 = Task(description="Completed task", status="completed")
-        mock_orch.tasks = {task1.id: task1, task2.id: task2}
+    @pytest.mark.parametrize(
+        "all_flag,status,tasks,expected",
+        [
+            (False, None, [SAMPLE_TASK], ["Sample Task"]),
+            # list doesn't filter by status in the handler, it shows all
+            (False, "completed", [PENDING_TASK, COMPLETED_TASK], ["Completed task"]),
+            (True, None, [ACTIVE_TASK, ARCHIVED_TASK], ["Active task", "Archived task"]),
+        ],
+        ids=["all_tasks", "by_status", "include_archived"],
+    )
+    def test_list(self, mock_orch, capsys, all_flag, status, tasks, expected):
+        """Test listing tasks, with and without archived ones."""
+        args = SimpleNamespace(status=status, all=all_flag)
+        mock_orch.tasks = {task.id: task for task in tasks}
 
         handle_list(mock_orch, args)
 
         captured = capsys.readouterr()
-        assert "Completed task" in captured.out
-        # Note: list doesn't filter by status in the handler, it shows all
+        for text in expected:
+            assert text in captured.out
 
-    def test_list_include_archived(self, mock_orch, capsys):
-        """Test listing tasks including archived ones."""
-        args = MagicMock()
-        args.status = None
-        args.all = True
+    def test_list_shows_first_line_only(self, mock_orch, capsys):
+        """Test list rows show only the first line of multi-line descriptions."""
+        args = SimpleNamespace(all=False)
 
-        task1 = Task(description="Active task", archived=False)
-        task2 = Task(description="Archived task", archived=True)
+        task1 = Task(description="Windows line\r\nhidden", modified_at=datetime(2024, 3, 5, 7, 9, 30))
+        task2 = Task(description="")
         mock_orch.tasks = {task1.id: task1, task2.id: task2}
 
         handle_list(mock_orch, args)
 
         captured = capsys.readouterr()
-        assert "Active task" in captured.out
-        assert "Archived task" in captured.out
+        assert "| 2024-03-05 07:09 " in captured.out
+        assert "Windows line " in captured.out
+        assert "hidden" not in captured.out
+        assert "\r" not in captured.out
 
 
 class TestHandleShow:
-    def test_show_existing_task(self, mock_orch, sample_task, capsys):
-        """Test showing details of an existing task."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
-
-        mock_orch.tasks = {sample_task.id: sample_task}
-        mock_orch.get_task.return_value = sample_task
-
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_show(mock_orch, args)
-
-        captured = capsys.readouterr()
-        assert "Sample Task" in captured.out
-
-    def test_show_nonexistent_task(self, mock_orch, capsys):
-        """Test showing a task that doesn't exist."""
-        args = MagicMock()
-        args.id = "nonexistent"
-
-        with patch("src.cli.get_task_id", return_value=None):
-            handle_show(mock_orch, args)
-
-        captured = capsys.readouterr()
-        assert "not found" in captured.out.lower()
-
-
-class TestHandleUpdate:
-    def test_update_description(self, mock_orch, sample_task, capsys):
-        """Test updating task description."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
-        args.desc = "Updated description"
-        args.status = None
-        args.deadline = None
+    def test_show_ambiguous_alias(self, mock_orch, capsys):
+        """Test that an alias shared by several tasks asks for the full UUID."""
+        u1 = UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592")
+        u2 = UUID("3077aaaa-3da3-4783-aff7-cbedfd5f5592")
+        mock_orch.alias_index = {generate_alias(u1).lower(): [u1, u2]}
 
-        updated_task = Task(id=sample_task.id, description="Updated description", status="pending")
-        mock_orch.update_task.return_value = updated_task
+        args = SimpleNamespace(id=generate_alias(u1))
 
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_update(mock_orch, args)
+        handle_show(mock_orch, args)
 
-        mock_orch.update_task.assert_called_once()
         captured = capsys.readouterr()
-        assert "Task updated" in captured.out
-
-    def test_update_status(self, mock_orch, sample_task, capsys):
-        """Test updating task status."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
-        args.desc = None
-        args.status = "completed"
-        args.deadline = None
-
-        updated_task = Task(id=sample_task.id, description="Sample Task", status="completed")
-        mock_orch.update_task.return_value = updated_task
-
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_update(mock_orch, args)
-
-        captured = capsys.readouterr()
-        assert "Task updated" in captured.out
-
-    def test_update_no_changes(self, mock_orch, sample_task, capsys):
-        """Test update with no actual changes."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
-        args.desc = None
-        args.status = None
-        args.deadline = None
-
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_update(mock_orch, args)
-
-        captured = capsys.readouterr()
-        assert "No updates provided" in captured.out
+        assert "use the full UUID" in captured.out
+        mock_orch.get_task.assert_not_called()
 
 
 class TestHandleAttach:
-    def test_attach_file(self, mock_orch, sample_task, tmp_path, capsys):
+    def test_attach_file(self, mock_orch, sample_task, patched_get_task_id, tmp_path, capsys):
         """Test attaching a file to a task."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
+        args = SimpleNamespace(id=str(sample_task.id))
         test_file = tmp_path / "test.txt"
         test_file.write_text("test content")
         args.filepath = str(test_file)
@@ -205,87 +206,55 @@ class TestHandleAttach:
         updated_task = sample_task
         mock_orch.add_attachment.return_value = updated_task
 
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_attach(mock_orch, args)
+        handle_attach(mock_orch, args)
 
         mock_orch.add_attachment.assert_called_once_with(sample_task.id, str(test_file))
         captured = capsys.readouterr()
         assert "Attachment added" in captured.out
 
-    def test_attach_nonexistent_file(self, mock_orch, sample_task, capsys):
+    def test_attach_nonexistent_file(self, mock_orch, sample_task, patched_get_task_id, capsys):
         """Test attaching a file that doesn't exist."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
-        args.filepath = "/nonexistent/file.txt"
+        args = SimpleNamespace(id=str(sample_task.id), filepath="/nonexistent/file.txt")
 
         mock_orch.add_attachment.side_effect = FileNotFoundError()
 
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            with pytest.raises(FileNotFoundError):
-                handle_attach(mock_orch, args)
+        with pytest.raises(FileNotFoundError):
+            handle_attach(mock_orch, args)
 
 
 class TestHandleExtract:
-    def test_extract_attachment(self, mock_orch, sample_task, tmp_path, capsys):
+    def test_extract_attachment(self, mock_orch, sample_task, patched_get_task_id, tmp_path, capsys):
         """Test extracting an attachment from a task."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
-        args.filename = "test.txt"
+        args = SimpleNamespace(id=str(sample_task.id), filename="test.txt")
         output_file = tmp_path / "output.txt"
         args.output = str(output_file)
 
         mock_orch.extract_attachment.return_value = True
 
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_extract(mock_orch, args)
+        handle_extract(mock_orch, args)
 
         mock_orch.extract_attachment.assert_called_once_with(sample_task.id, "test.txt", str(output_file))
         captured = capsys.readouterr()
         assert "extracted to" in captured.out
 
-    def test_extract_nonexistent_attachment(self, mock_orch, sample_task, tmp_path, capsys):
+    def test_extract_nonexistent_attachment(self, mock_orch, sample_task, patched_get_task_id, tmp_path, capsys):
         """Test extracting an attachment that doesn't exist."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
-        args.filename = "nonexistent.txt"
-        args.output = str(tmp_path / "output.txt")
+        args = SimpleNamespace(id=str(sample_task.id), filename="nonexistent.txt", output=str(tmp_path / "output.txt"))
 
         mock_orch.extract_attachment.return_value = False
 
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_extract(mock_orch, args)
+        handle_extract(mock_orch, args)
 
         captured = capsys.readouterr()
         assert "failed" in captured.out.lower() or "check" in captured.out.lower()
 
 
-class TestHandleDuplicate:
-    def test_duplicate_task(self, mock_orch, sample_task, capsys):
-        """Test duplicating a task."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
-
-        new_task = Task(description="Sample Task", status="pending")
-        mock_orch.duplicate_task.return_value = new_task
-
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_duplicate(mock_orch, args)
-
-        mock_orch.duplicate_task.assert_called_once_with(sample_task.id)
-        captured = capsys.readouterr()
-        assert "duplicated successfully" in captured.out.lower()
-
-
 class TestHandleKanban:
-    def test_kanban_all_statuses(self, mock_orch, capsys):
+    def test_kanban_all_statuses(self, mock_orch, pending_and_completed_tasks, capsys):
         """Test rendering kanban board with all statuses."""
-        args = MagicMock()
-        args.status = None
-        args.all = False
+        args = SimpleNamespace(status=None, all=False)
 
-        task1 = Task(description="Pending task", status="pending")
-        task2 = Task(description="Completed task", status="completed")
-        mock_orch.tasks = {task1.id: task1, task2.id: task2}
+        mock_orch.tasks = dict(pending_and_completed_tasks)
         args.statuses = ["pending", "completed"]
 
         handle_kanban(mock_orch, args)
@@ -294,90 +263,76 @@ class TestHandleKanban:
         assert "PENDING" in captured.out
         assert "COMPLETED" in captured.out
 
-    def test_kanban_filtered_status(self, mock_orch, capsys):
+    def test_kanban_filtered_status(self, mock_orch, pending_and_completed_tasks, capsys):
         """Test rendering kanban board filtered by status."""
-        args = MagicMock()
-        args.statuses = ["pending"]
-        args.all = False
+        args = SimpleNamespace(statuses=["pending"], all=False)
 
-        task1 = Task(description="Pending task", status="pending")
-        task2 = Task(description="Completed task", status="completed")
-        mock_orch.tasks = {task1.id: task1, task2.id: task2}
+        mock_orch.tasks = dict(pending_and_completed_tasks)
 
         handle_kanban(mock_orch, args)
 
         captured = capsys.readouterr()
         assert "PENDING" in captured.out
 
+    def test_kanban_groups_case_insensitively(self, mock_orch, capsys):
+        """Test that statuses match regardless of case and archived tasks are hidden."""
+        args = SimpleNamespace(statuses=["pending", "Done"])
 
-class TestHandleArchive:
-    def test_archive_task(self, mock_orch, sample_task, capsys):
-        """Test archiving a task."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
-
-        archived_task = Task(id=sample_task.id, description="Sample Task", archived=True)
-        mock_orch.archive_task.return_value = archived_task
+        task1 = Task(description="Mixed case task", status="PENDING")
+        task2 = Task(description="Finished task", status="done")
+        task3 = Task(description="Archived task", status="pending", archived=True)
+        mock_orch.tasks = {task1.id: task1, task2.id: task2, task3.id: task3}
 
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_archive(mock_orch, args)
+        handle_kanban(mock_orch, args)
 
-        mock_orch.archive_task.assert_called_once_with(sample_task.id)
         captured = capsys.readouterr()
-        assert "archived" in captured.out
-
-
-class TestHandleUnarchive:
-    def test_unarchive_task(self, mock_orch, sample_task, capsys):
-        """Test unarchiving a task."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
-
-        unarchived_task = Task(id=sample_task.id, description="Sample Task", archived=False)
-        mock_orch.unarchive_task.return_value = unarchived_task
+        assert "Mixed case task" in captured.out
+        assert "Finished task" in captured.out
+        assert "Archived task" not in captured.out
+
+
+class TestSimpleIdHandlers:
+    @pytest.mark.parametrize(
+        "handler,orch_method,return_value,expected",
+        [
+            (handle_archive, "archive_task", Task(description="Sample Task", archived=True), "archived"),
+            (handle_unarchive, "unarchive_task", Task(description="Sample Task", archived=False), "unarchived"),
+            (handle_delete, "delete_task", True, "deleted"),
+            (handle_duplicate, "duplicate_task", Task(description="Sample Task"), "duplicated successfully"),
+        ],
+        ids=["archive", "unarchive", "delete", "duplicate"],
+    )
+    def test_simple_id_handler(
+        self, mock_orch, sample_task, patched_get_task_id, capsys, handler, orch_method, return_value, expected
+    ):
+        """Test handlers that resolve an id and call a single tracker method."""
+        args = SimpleNamespace(id=str(sample_task.id))
+        getattr(mock_orch, orch_method).return_value = return_value
 
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_unarchive(mock_orch, args)
+        handler(mock_orch, args)
 
-        mock_orch.unarchive_task.assert_called_once_with(sample_task.id)
+        getattr(mock_orch, orch_method).assert_called_once_with(sample_task.id)
         captured = capsys.readouterr()
-        assert "unarchived" in captured.out
+        assert expected in captured.out
 
 
 class TestHandleDelete:
-    def test_delete_task_success(self, mock_orch, sample_task, capsys):
-        """Test successfully deleting a task."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
-
-        mock_orch.delete_task.return_value = True
-
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_delete(mock_orch, args)
-
-        mock_orch.delete_task.assert_called_once_with(sample_task.id)
-        captured = capsys.readouterr()
-        assert "deleted" in captured.out
-
-    def test_delete_task_failure(self, mock_orch, sample_task, capsys):
+    def test_delete_task_failure(self, mock_orch, sample_task, patched_get_task_id, capsys):
         """Test failing to delete a task."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
+        args = SimpleNamespace(id=str(sample_task.id))
 
         mock_orch.delete_task.return_value = False
 
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_delete(mock_orch, args)
+        handle_delete(mock_orch, args)
 
         captured = capsys.readouterr()
         assert "Failed" in captured.out or "not found" in captured.out.lower()
 
 
 class TestHandleHistory:
-    def test_show_history(self, mock_orch, sample_task, capsys):
+    def test_show_history(self, mock_orch, sample_task, patched_get_task_id, capsys):
         """Test showing task history."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
+        args = SimpleNamespace(id=str(sample_task.id))
 
         v1 = Task(id=sample_task.id, description="Version 1")
         v2 = Task(id=sample_task.id, description="Version 2")
@@ -385,8 +340,7 @@ class TestHandleHistory:
 
         mock_orch.get_history.return_value = [v3, v2, v1]
 
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_history(mock_orch, args)
+        handle_history(mock_orch, args)
 
         mock_orch.get_history.assert_called_once_with(sample_task.id)
         captured = capsys.readouterr()
@@ -394,16 +348,32 @@ class TestHandleHistory:
         assert "Version 2" in captured.out
         assert "Version 3" in captured.out
 
-    def test_show_history_empty(self, mock_orch, sample_task, capsys):
+    def test_show_history_empty(self, mock_orch, sample_task, patched_get_task_id, capsys):
         """Test showing history for a task with no history."""
-        args = MagicMock()
-        args.id = str(sample_task.id)
+        args = SimpleNamespace(id=str(sample_task.id))
 
         mock_orch.get_history.return_value = []
 
-        with patch("src.cli.get_task_id", return_value=sample_task):
-            handle_history(mock_orch, args)
+        handle_history(mock_orch, args)
 
         captured = capsys.readouterr()
         # Empty history returns "Task not found" message
         assert "Task not found" in captured.out or captured.out == ""
+
+
+class TestBuildParser:
+    def test_single_command_parser(self):
+        """Test that a known command only builds its own subparser."""
+        parser = build_parser("list")
+        args = parser.parse_args(["list", "-a"])
+        assert args.command == "list"
+        assert args.all is True
+
+        with pytest.raises(SystemExit):
+            parser.parse_args(["show", "some-id"])
+
+    def test_unknown_command_builds_full_parser(self):
+        """Test that an unknown or missing command falls back to every subparser."""
+        parser = build_parser("bogus")
+        assert parser.parse_args(["show", "some-id"]).id == "some-id"
+        assert build_parser().parse_args(["dump", "--history"]).history is True
@@ -1,7 +1,28 @@
 import pytest
 from src.tracker import TodoTracker
-from src.cli import main
-from unittest.mock import patch
+from src.alias import generate_alias
+from src.cli import get_task_id, group_tasks_by_status, main
+from src.models import Attachment, Task
+from unittest.mock import MagicMock, patch
+from uuid import UUID
+
+# Attachment payload shared by the tests that only need some content
+SAMPLE_CONTENT = b"x" * 64
+
+
+def attach_bytes(tracker, task_id, filename, data):
+    """Attaches in-memory content to a task, without writing a source file."""
+    task = tracker.get_task(task_id)
+    attachment = Attachment(filename=filename, content_hash=tracker.storage.store_blob(data))
+    return tracker.update_task(task_id, attachments=task.attachments + [attachment])
+
+
+def read_attachment(tracker, task_id, filename):
+    """Returns the stored content of a task's attachment, without extracting it to disk."""
+    for att in tracker.get_task(task_id).attachments:
+        if att.filename == filename:
+            return tracker.storage.get_object(att.content_hash)
+    return None
 
 
 @pytest.fixture
@@ -10,6 +31,15 @@ def isolated_tracker(tmp_path):
     return TodoTracker(root_dir=str(tmp_path / "store"))
 
 
+@pytest.fixture
+def mock_cli_tracker(monkeypatch):
+    """Make every TodoTracker the CLI builds this one mock."""
+    mock = MagicMock(spec=TodoTracker)
+    mock.tasks = {}
+    monkeypatch.setattr("src.cli.TodoTracker", lambda *args, **kwargs: mock)
+    return mock
+
+
 class TestTaskLifecycle:
     def test_complete_task_lifecycle(self, isolated_tracker):
         """Test complete lifecycle: add -> update -> archive -> unarchive -> delete."""
@@ -82,65 +112,46 @@ class TestTaskLifecycle:
 
 
 class TestAttachmentWorkflow:
-    def test_attach_and_extract_workflow(self, isolated_tracker, tmp_path):
-        """Test complete attachment workflow: add task -> attach file -> extract file"""
+    def test_attach_and_extract_workflow(self, isolated_tracker):
+        """Test complete attachment workflow: add task -> attach content -> read it back"""
         # Create task
         task = isolated_tracker.add_task("Task with attachment")
 
-        # Create a test file
-        test_file = tmp_path / "original.txt"
-        test_content = "This is test content for attachment workflow"
-        test_file.write_text(test_content)
-
-        # Attach file
-        updated = isolated_tracker.add_attachment(task.id, str(test_file))
+        # Attach content held in memory
+        updated = attach_bytes(isolated_tracker, task.id, "original.txt", SAMPLE_CONTENT)
         assert len(updated.attachments) == 1
         assert updated.attachments[0].filename == "original.txt"
 
-        # Extract file
-        output_file = tmp_path / "extracted.txt"
-        success = isolated_tracker.extract_attachment(task.id, "original.txt", str(output_file))
-        assert success is True
-        assert output_file.exists()
-        assert output_file.read_text() == test_content
+        # Read it back
+        assert read_attachment(isolated_tracker, task.id, "original.txt") == SAMPLE_CONTENT
 
         # Verify task still exists with attachment
         task = isolated_tracker.get_task(task.id)
         assert len(task.attachments) == 1
 
-    def test_multiple_attachments_workflow(self, isolated_tracker, tmp_path):
+    def test_multiple_attachments_workflow(self, isolated_tracker):
         """Test workflow with multiple attachments."""
         task = isolated_tracker.add_task("Multi-attachment task")
 
-        # Attach multiple files
-        files = []
+        # Attach multiple payloads held in memory
         for i in range(3):
-            file_path = tmp_path / f"file{i}.txt"
-            file_path.write_text(f"Content {i}")
-            files.append(file_path)
-            isolated_tracker.add_attachment(task.id, str(file_path))
+            attach_bytes(isolated_tracker, task.id, f"file{i}.txt", f"Content {i}".encode())
 
         # Verify all attachments
         task = isolated_tracker.get_task(task.id)
-        assert len(task.attachments) == 3
+        assert [att.filename for att in task.attachments] == ["file0.txt", "file1.txt", "file2.txt"]
 
-        # Extract all attachments
+        # Each name still resolves to its own content
         for i in range(3):
-            output = tmp_path / f"extracted{i}.txt"
-            success = isolated_tracker.extract_attachment(task.id, f"file{i}.txt", str(output))
-            assert success is True
-            assert output.read_text() == f"Content {i}"
+            assert read_attachment(isolated_tracker, task.id, f"file{i}.txt") == f"Content {i}".encode()
 
 
 class TestDuplicationWorkflow:
-    def test_duplicate_and_modify_workflow(self, isolated_tracker, tmp_path):
+    def test_duplicate_and_modify_workflow(self, isolated_tracker):
         """Test duplicating a task and modifying the duplicate independently."""
         # Create original task with attachment
         original = isolated_tracker.add_task("Original task")
-
-        test_file = tmp_path / "shared.txt"
-        test_file.write_text("Shared content")
-        isolated_tracker.add_attachment(original.id, str(test_file))
+        attach_bytes(isolated_tracker, original.id, "shared.txt", SAMPLE_CONTENT)
 
         # Update original to completed
         isolated_tracker.update_task(original.id, status="completed")
@@ -169,16 +180,19 @@ class TestDuplicationWorkflow:
 
     def test_duplicate_chain(self, isolated_tracker):
         """Test creating a chain of duplicates."""
-        # Create original
-        task1 = isolated_tracker.add_task("Generation 1")
+        # One lock acquisition, and each ref is written once when the batch ends
+        with isolated_tracker.batch():
+            # Create original
+            task1 = isolated_tracker.add_task("Generation 1")
 
-        # Duplicate to create generation 2
-        task2 = isolated_tracker.duplicate_task(task1.id)
-        isolated_tracker.update_task(task2.id, description="Generation 2")
+            # Duplicate to create generation 2
+            task2 = isolated_tracker.duplicate_task(task1.id)
+            isolated_tracker.update_task(task2.id, description="Generation 2")
 
-        # Duplicate generation 2 to create generation 3
-        task3 = isolated_tracker.duplicate_task(task2.id)
-        isolated_tracker.update_task(task3.id, description="Generation 3")
+            # Duplicating generation 2 copies its current description
+            task3 = isolated_tracker.duplicate_task(task2.id)
+            assert task3.description == "Generation 2"
+            isolated_tracker.update_task(task3.id, description="Generation 3")
 
         # Verify all exist independently
         assert isolated_tracker.get_task(task1.id).description == "Generation 1"
@@ -248,11 +262,11 @@ class TestPersistenceWorkflow:
         assert loaded2.description == "Persistent task 2"
         assert loaded2.archived is True
 
-        # Session 3: Make more changes and verify
+        # Session 3: Make more changes from another tracker and reload
         tracker2.update_task(task1_id, description="Updated in session 2")
 
-        tracker3 = TodoTracker(root_dir=str(store_path))
-        loaded1_again = tracker3.get_task(task1_id)
+        tracker1.reload()
+        loaded1_again = tracker1.tasks[task1_id]
         assert loaded1_again.description == "Updated in session 2"
 
     def test_persistence_with_attachments(self, tmp_path):
@@ -262,10 +276,7 @@ class TestPersistenceWorkflow:
         # Session 1: Add task with attachment
         tracker1 = TodoTracker(root_dir=str(store_path))
         task = tracker1.add_task("Task with attachment")
-
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("Persistent content")
-        tracker1.add_attachment(task.id, str(test_file))
+        attach_bytes(tracker1, task.id, "test.txt", SAMPLE_CONTENT)
 
         task_id = task.id
 
@@ -276,11 +287,8 @@ class TestPersistenceWorkflow:
         assert len(loaded.attachments) == 1
         assert loaded.attachments[0].filename == "test.txt"
 
-        # Extract and verify content
-        output = tmp_path / "extracted.txt"
-        success = tracker2.extract_attachment(task_id, "test.txt", str(output))
-        assert success is True
-        assert output.read_text() == "Persistent content"
+        # Verify content
+        assert read_attachment(tracker2, task_id, "test.txt") == SAMPLE_CONTENT
 
 
 class TestKanbanWorkflow:
@@ -300,13 +308,7 @@ class TestKanbanWorkflow:
         isolated_tracker.update_task(task5.id, status="completed")
 
         # Group by status
-        tasks_by_status = {}
-        for task in isolated_tracker.tasks.values():
-            if not task.archived:
-                status = task.status
-                if status not in tasks_by_status:
-                    tasks_by_status[status] = []
-                tasks_by_status[status].append(task)
+        tasks_by_status = group_tasks_by_status(isolated_tracker.tasks.values(), ["pending", "in-progress", "completed"])
 
         # Verify grouping
         assert len(tasks_by_status["pending"]) == 2
@@ -315,47 +317,67 @@ class TestKanbanWorkflow:
 
 
 class TestCLIIntegration:
-    def test_cli_add_and_list(self, tmp_path):
+    def test_cli_add_and_list(self, mock_cli_tracker):
         """Test CLI add and list commands integration."""
-        with patch("src.cli.TodoTracker") as MockTracker:
-            orch = MockTracker.return_value
-            orch.tasks = {}
+        # Add task via CLI
+        new_task = Task(description="CLI task")
+        mock_cli_tracker.add_task.return_value = new_task
 
-            from src.models import Task
+        with patch("sys.argv", ["cli.py", "add", "CLI task"]):
+            main()
 
-            # Add task via CLI
-            new_task = Task(description="CLI task")
-            orch.add_task.return_value = new_task
+        mock_cli_tracker.add_task.assert_called_once()
 
-            with patch("sys.argv", ["cli.py", "add", "CLI task"]):
-                main()
+    def test_cli_full_workflow(self, mock_cli_tracker, capsys):
+        """Test a complete CLI workflow with mocked tracker."""
+        task_id = UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592")
+        task = Task(id=task_id, description="Test task", status="pending")
 
-            orch.add_task.assert_called_once()
+        mock_cli_tracker.tasks = {task_id: task}
+        mock_cli_tracker.add_task.return_value = task
+        mock_cli_tracker.get_task.return_value = task
 
-    def test_cli_full_workflow(self, tmp_path, capsys):
-        """Test a complete CLI workflow with mocked tracker."""
-        with patch("src.cli.TodoTracker") as MockTracker:
-            orch = MockTracker.return_value
+        # Add task
+        with patch("sys.argv", ["cli.py", "add", "Test task"]):
+            main()
 
-            from src.models import Task
-            from uuid import UUID
+        # List tasks
+        with patch("sys.argv", ["cli.py", "list"]):
+            main()
+            captured = capsys.readouterr()
+            assert "Test task" in captured.out
 
-            task_id = UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592")
-            task = Task(id=task_id, description="Test task", status="pending")
+    def test_cli_batch_reuses_tracker(self, isolated_tracker, capsys):
+        """Test that batch mode runs every stdin command against one tracker."""
+        import io
 
-            orch.tasks = {task_id: task}
-            orch.add_task.return_value = task
-            orch.get_task.return_value = task
+        commands = 'add "Batch task"\n\n# comment\nlist\n'
 
-            # Add task
-            with patch("sys.argv", ["cli.py", "add", "Test task"]):
+        with patch("src.cli.TodoTracker", return_value=isolated_tracker) as MockTracker:
+            with patch("sys.argv", ["cli.py", "batch"]), patch("sys.stdin", io.StringIO(commands)):
                 main()
 
-            # List tasks
-            with patch("sys.argv", ["cli.py", "list"]):
-                main()
-                captured = capsys.readouterr()
-                assert "Test task" in captured.out
+            MockTracker.assert_called_once()
+
+        captured = capsys.readouterr()
+        assert "Task created" in captured.out
+        assert "Batch task" in captured.out
+        assert len(isolated_tracker.tasks) == 1
+
+    @pytest.mark.parametrize("bad_line", ["bogus-command", 'add "unterminated', "batch"])
+    def test_cli_batch_fails_on_bad_line(self, isolated_tracker, capsys, bad_line):
+        """Test that a batch with an unrunnable line still runs the rest, then exits non-zero."""
+        import io
+
+        commands = f'add "Before"\n{bad_line}\nadd "After"\n'
+
+        with patch("src.cli.TodoTracker", return_value=isolated_tracker):
+            with patch("sys.argv", ["cli.py", "batch"]), patch("sys.stdin", io.StringIO(commands)):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 1
+        assert sorted(t.description for t in isolated_tracker.tasks.values()) == ["After", "Before"]
 
 
 class TestErrorRecovery:
@@ -378,17 +400,14 @@ class TestErrorRecovery:
         task = isolated_tracker.get_task(task.id)
         assert task.description == original_description
 
-    def test_delete_with_shared_attachments(self, isolated_tracker, tmp_path):
+    def test_delete_with_shared_attachments(self, isolated_tracker):
         """Test that deleting a task with shared attachments works correctly."""
         # Create two tasks sharing an attachment
         task1 = isolated_tracker.add_task("Task 1")
         task2 = isolated_tracker.add_task("Task 2")
 
-        test_file = tmp_path / "shared.txt"
-        test_file.write_text("Shared content")
-
-        isolated_tracker.add_attachment(task1.id, str(test_file))
-        isolated_tracker.add_attachment(task2.id, str(test_file))
+        attach_bytes(isolated_tracker, task1.id, "shared.txt", SAMPLE_CONTENT)
+        attach_bytes(isolated_tracker, task2.id, "shared.txt", SAMPLE_CONTENT)
 
         # Get content hash
         task1_loaded = isolated_tracker.get_task(task1.id)
@@ -405,3 +424,76 @@ class TestErrorRecovery:
 
         # Now attachment should be deleted
         assert isolated_tracker.storage.get_object(content_hash) is None
+
+
+class TestGetTaskId:
+    def test_resolve_by_uuid(self, isolated_tracker):
+        """Test resolving a task from its full UUID string."""
+        task = isolated_tracker.add_task("By UUID")
+        assert get_task_id(isolated_tracker, str(task.id)).id == task.id
+
+    def test_resolve_by_alias(self, isolated_tracker):
+        """Test resolving a task from its alias, with and without a version."""
+        task = isolated_tracker.add_task("Version 1")
+        isolated_tracker.update_task(task.id, description="Version 2")
+        alias = generate_alias(task.id)
+
+        assert get_task_id(isolated_tracker, alias).description == "Version 2"
+        assert get_task_id(isolated_tracker, f"{alias}-1", allow_version=True).description == "Version 1"
+        # Without allow_version the suffix is ignored and the current version returned
+        assert get_task_id(isolated_tracker, f"{alias}-1").description == "Version 2"
+
+    def test_resolve_invalid(self, isolated_tracker):
+        """Test that unknown inputs raise ValueError."""
+        with pytest.raises(ValueError):
+            get_task_id(isolated_tracker, "Non-Existent")
+        with pytest.raises(ValueError):
+            get_task_id(isolated_tracker, "z" * 36)
+
+
+def test_cli_import_defers_tracker():
+    """Importing the CLI must not pull in the tracker (and pydantic) until needed."""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    code = (
+        "import sys, src.cli\n"
+        "assert 'src.tracker' not in sys.modules\n"
+        "src.cli.TodoTracker\n"
+        "assert 'src.tracker' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parent.parent)
+
+
+def test_cli_dump_to_closed_pipe(tmp_path):
+    """`todo dump --history | head` must exit quietly once the reader goes away."""
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    # Far more output than a pipe buffers, so the dump is still writing when
+    # the pipe closes
+    tracker = TodoTracker(root_dir=str(tmp_path / ".todo_store"))
+    with tracker.batch():
+        for i in range(50):
+            task = tracker.add_task(f"Task {i} " + "x" * 4000)
+            tracker.update_task(task.id, status="done")
+
+    repo_root = Path(__file__).resolve().parent.parent
+    env = dict(os.environ, PYTHONPATH=str(repo_root))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.cli", "dump", "--history"],
+        cwd=tmp_path,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    assert proc.stdout.readline() == b"[\n"
+    proc.stdout.close()
+    stderr = proc.stderr.read()
+    proc.wait()
+
+    assert b"Traceback" not in stderr
+    assert b"BrokenPipeError" not in stderr
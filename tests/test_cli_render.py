@@ -1,10 +1,12 @@
+import pytest
 from src.cli import render_kanban_board
 from src.models import Task
 from uuid import UUID
 
 
-def test_render_kanban_board():
-    # Setup mock tasks
+@pytest.fixture(scope="module")
+def sample_tasks():
+    # Built once; render_kanban_board never mutates its input tasks
     t1 = Task(
         id=UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592"),
         description="Task 1",
@@ -15,6 +17,11 @@ def test_render_kanban_board():
         description="Task 2",
         status="completed",
     )
+    return t1, t2
+
+
+def test_render_kanban_board(sample_tasks):
+    t1, t2 = sample_tasks
 
     tasks_by_status = {"pending": [t1], "completed": [t2]}
 
@@ -36,12 +43,8 @@ def test_render_kanban_board():
     assert "┘" in board
 
 
-def test_render_kanban_empty_column():
-    t1 = Task(
-        id=UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592"),
-        description="Task 1",
-        status="pending",
-    )
+def test_render_kanban_empty_column(sample_tasks):
+    t1, _ = sample_tasks
 
     tasks_by_status = {"pending": [t1], "completed": []}
 
@@ -1,6 +1,7 @@
 import pytest
 from src.models import Task
 from src.tracker import TodoTracker
+from src.alias import generate_alias
 
 
 @pytest.fixture
@@ -53,6 +54,20 @@ def test_orchestrator_add_attachment(orchestrator, tmp_path):
     assert updated_task.attachments[0].content_hash is not None
 
 
+def test_orchestrator_add_attachment_with_updates(orchestrator, tmp_path):
+    task = orchestrator.add_task(description="Draft")
+    file_path = tmp_path / "report.txt"
+    file_path.write_text("final")
+
+    updated_task = orchestrator.add_attachment(task.id, str(file_path), description="Final", status="done")
+
+    # Attachment and field changes land in a single new version
+    assert updated_task.description == "Final"
+    assert updated_task.status == "done"
+    assert [att.filename for att in updated_task.attachments] == ["report.txt"]
+    assert len(orchestrator.get_history(task.id)) == 2
+
+
 def test_orchestrator_extract_attachment(orchestrator, tmp_path):
     task = orchestrator.add_task(description="With Attachment")
 
@@ -73,25 +88,31 @@ def test_orchestrator_extract_attachment(orchestrator, tmp_path):
     assert extracted_file.read_text() == original_content
 
 
-def test_get_task_version(orchestrator):
+@pytest.fixture(scope="module")
+def versioned_task(tmp_path_factory):
+    # Shared by the version probes below, which only read from it
+    orchestrator = TodoTracker(root_dir=str(tmp_path_factory.mktemp("versions")))
     task = orchestrator.add_task(description="Version 1")
 
     # Update twice
     orchestrator.update_task(task.id, description="Version 2")
     orchestrator.update_task(task.id, description="Version 3")
+    return orchestrator, task.id
 
-    # Get specific versions
-    v1 = orchestrator.get_task_version(task.id, 1)
-    v2 = orchestrator.get_task_version(task.id, 2)
-    v3 = orchestrator.get_task_version(task.id, 3)
 
-    assert v1.description == "Version 1"
-    assert v2.description == "Version 2"
-    assert v3.description == "Version 3"
+@pytest.mark.parametrize(
+    "version,expected",
+    [(0, None), (1, "Version 1"), (2, "Version 2"), (3, "Version 3"), (4, None)],
+)
+def test_get_task_version(versioned_task, version, expected):
+    orchestrator, task_id = versioned_task
+    found = orchestrator.get_task_version(task_id, version)
 
-    # Out of bounds
-    assert orchestrator.get_task_version(task.id, 0) is None
-    assert orchestrator.get_task_version(task.id, 4) is None
+    if expected is None:
+        # Out of bounds
+        assert found is None
+    else:
+        assert found.description == expected
 
 
 def test_duplicate_task(orchestrator, tmp_path):
@@ -121,30 +142,20 @@ def test_duplicate_task(orchestrator, tmp_path):
     assert duplicate.attachments[0].content_hash == current.attachments[0].content_hash
 
 
-def test_archive_task(orchestrator):
-    task = orchestrator.add_task(description="Task to Archive")
-    assert not task.archived
+@pytest.mark.parametrize("verb,start_archived,expected", [("archive_task", False, True), ("unarchive_task", True, False)])
+def test_archive_flag(orchestrator, verb, start_archived, expected):
+    task = orchestrator.add_task(description="Task to toggle")
+    if start_archived:
+        orchestrator.archive_task(task.id)
+    assert orchestrator.get_task(task.id).archived is start_archived
 
-    updated = orchestrator.archive_task(task.id)
-    assert updated.archived
+    updated = getattr(orchestrator, verb)(task.id)
+    assert updated.archived is expected
     assert updated.id == task.id
 
     # Verify persistence
     loaded = orchestrator.get_task(task.id)
-    assert loaded.archived
-
-
-def test_unarchive_task(orchestrator):
-    task = orchestrator.add_task(description="Task to Unarchive")
-    orchestrator.archive_task(task.id)
-    assert orchestrator.get_task(task.id).archived
-
-    updated = orchestrator.unarchive_task(task.id)
-    assert not updated.archived
-
-    # Verify persistence
-    loaded = orchestrator.get_task(task.id)
-    assert not loaded.archived
+    assert loaded.archived is expected
 
 
 def test_delete_task_with_attachments(orchestrator, tmp_path):
@@ -195,15 +206,21 @@ def test_delete_task_shared_attachment(orchestrator, tmp_path):
     assert orchestrator.storage.get_object(content_hash) is None
 
 
-def test_delete_task(orchestrator):
-    task = orchestrator.add_task(description="Task to Delete")
+def test_alias_index(orchestrator, tmp_path):
+    task = orchestrator.add_task(description="Indexed")
+    key = generate_alias(task.id).lower()
+    assert task.id in orchestrator.alias_index[key]
 
-    # Delete
-    success = orchestrator.delete_task(task.id)
-    assert success
+    # Updates keep a single entry per task
+    orchestrator.update_task(task.id, status="completed")
+    assert orchestrator.alias_index[key].count(task.id) == 1
 
-    # Verify gone
-    assert orchestrator.get_task(task.id) is None
+    duplicate = orchestrator.duplicate_task(task.id)
+    assert duplicate.id in orchestrator.alias_index[generate_alias(duplicate.id).lower()]
+
+    # Index is rebuilt on reload
+    reloaded = TodoTracker(root_dir=str(tmp_path))
+    assert task.id in reloaded.alias_index[key]
 
-    # Delete non-existent
-    assert not orchestrator.delete_task(task.id)
+    orchestrator.delete_task(task.id)
+    assert task.id not in orchestrator.alias_index.get(key, [])
@@ -37,30 +37,23 @@ def test_dump_history_scenario(tmp_path):
 
     # Now simulate the dump --history logic
     tasks_to_dump = []
-    for task in orch.tasks.values():
-        history = orch.get_history(task.id)
-        for version in history:
-            tasks_to_dump.append(version.model_dump(mode="json"))
+    for _, history in orch.iter_all_history():
+        tasks_to_dump.extend(history)
 
     # Verify we have 3 tasks in the dump
     assert len(tasks_to_dump) == 3, f"Expected 3 tasks, got {len(tasks_to_dump)}"
 
     # Verify the descriptions
-    descriptions = [t["description"] for t in tasks_to_dump]
+    descriptions = [t.description for t in tasks_to_dump]
     assert descriptions.count("Task A") == 2, "Should have 2 versions of Task A"
     assert descriptions.count("Task B") == 1, "Should have 1 version of Task B"
 
     # Verify the statuses
-    statuses = [t["status"] for t in tasks_to_dump]
+    statuses = [t.status for t in tasks_to_dump]
     assert statuses.count("pending") == 2, "Should have 2 pending tasks (Task A v1 and Task B v1)"
     assert statuses.count("completed") == 1, "Should have 1 completed task (Task A v2)"
 
-    print(f"\n✓ Dump contains {len(tasks_to_dump)} tasks as expected")
-    task_a_pending = [t for t in tasks_to_dump if t["description"] == "Task A" and t["status"] == "pending"][0]
-    print(f"  - Task A (pending): {task_a_pending['id'][:8]}")
-
-    task_a_completed = [t for t in tasks_to_dump if t["description"] == "Task A" and t["status"] == "completed"][0]
-    print(f"  - Task A (completed): {task_a_completed['id'][:8]}")
-
-    task_b_pending = [t for t in tasks_to_dump if t["description"] == "Task B"][0]
-    print(f"  - Task B (pending): {task_b_pending['id'][:8]}")
+    # Both Task A entries are versions of the same task
+    task_a_versions = {(t.id, t.status) for t in tasks_to_dump if t.description == "Task A"}
+    assert len({task_id for task_id, _ in task_a_versions}) == 1
+    assert {status for _, status in task_a_versions} == {"pending", "completed"}
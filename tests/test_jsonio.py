@@ -0,0 +1,73 @@
+import json
+import pytest
+from datetime import datetime
+from uuid import UUID
+from src import jsonio
+
+SAMPLE = {
+    "description": 'Hello 世界 "quoted"\nline',
+    "id": "3077bee6-3da3-4783-aff7-cbedfd5f5592",
+    "attachments": [],
+    "archived": False,
+    "parent": None,
+    "nested": {"b": 2, "a": 1},
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run a test against both the orjson and the stdlib json backends."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(jsonio, "orjson", None)
+    return request.param
+
+
+def test_canonical_roundtrip(backend):
+    """Canonical bytes parse back with either loads backend."""
+    data = jsonio.dumps_canonical(SAMPLE)
+    assert isinstance(data, bytes)
+    assert jsonio.loads(data) == SAMPLE
+
+
+def test_canonical_keeps_store_format():
+    """Content hashes of existing stores depend on these exact bytes."""
+    assert jsonio.dumps_canonical({"b": 1, "a": [1, 2], "c": "é"}) == b'{"a": [1, 2], "b": 1, "c": "\\u00e9"}'
+
+
+def test_canonical_converts_unknown_types_with_str():
+    data = {"when": datetime(2025, 12, 3, 12, 0, 0), "id": UUID("3077bee6-3da3-4783-aff7-cbedfd5f5592")}
+    assert jsonio.loads(jsonio.dumps_canonical(data)) == {
+        "when": "2025-12-03 12:00:00",
+        "id": "3077bee6-3da3-4783-aff7-cbedfd5f5592",
+    }
+
+
+def _pretty(item):
+    return json.dumps(item, indent=2)
+
+
+@pytest.mark.parametrize("items", [[], [SAMPLE], [SAMPLE, {"x": [1, {"y": None}]}, []]])
+def test_dump_pretty_array_matches_indented_dump(items):
+    import io
+
+    buf = io.StringIO()
+    count = jsonio.dump_pretty_array(iter(items), buf, serialize=_pretty)
+    assert count == len(items)
+    assert buf.getvalue() == json.dumps(items, indent=2)
+
+
+def test_dump_pretty_array_custom_serializer():
+    import io
+    from src.models import Task
+
+    tasks = [Task(description="One"), Task(description="Two", status="done")]
+    buf = io.StringIO()
+    assert jsonio.dump_pretty_array(tasks, buf, serialize=lambda t: t.model_dump_json(indent=2)) == 2
+    assert json.loads(buf.getvalue()) == [t.model_dump(mode="json") for t in tasks]
+
+
+def test_loads_invalid(backend):
+    with pytest.raises(json.JSONDecodeError):
+        jsonio.loads(b"not valid json {{")
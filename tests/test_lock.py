@@ -1,8 +1,12 @@
 import pytest
-import time
+import signal
 import threading
 from src.lock import FileLock
 
+# Lock tests block on real threads; under pytest -n auto --dist=loadgroup they
+# share one worker while the fast tests spread over the others
+pytestmark = [pytest.mark.slow, pytest.mark.xdist_group("locks")]
+
 
 def test_lock_acquire_release(tmp_path):
     lock_file = tmp_path / "test.lock"
@@ -22,50 +26,140 @@ def test_lock_acquire_release(tmp_path):
 
 def test_lock_contention(tmp_path):
     lock_file = tmp_path / "contention.lock"
-    lock1 = FileLock(str(lock_file), timeout=1.0)
-    lock2 = FileLock(str(lock_file), timeout=1.0)
+    lock1 = FileLock(str(lock_file), timeout=5.0)
+    lock2 = FileLock(str(lock_file), timeout=5.0)
+    acquired = threading.Event()
+    release = threading.Event()
+    order = []
 
-    # Thread 1 holds lock
+    # Thread 1 holds lock until told to release it
     def hold_lock():
         with lock1.acquire():
-            time.sleep(0.5)
+            acquired.set()
+            release.wait()
+            order.append("released")
 
-    t = threading.Thread(target=hold_lock)
-    t.start()
+    # Thread 2 tries to acquire (should wait and succeed)
+    def wait_for_lock():
+        with lock2.acquire():
+            order.append("acquired")
 
-    # Give thread time to acquire
-    time.sleep(0.1)
+    t1 = threading.Thread(target=hold_lock)
+    t1.start()
+    acquired.wait()
 
-    # Thread 2 tries to acquire (should wait and succeed)
-    start = time.time()
-    with lock2.acquire():
-        pass
-    end = time.time()
+    t2 = threading.Thread(target=wait_for_lock)
+    t2.start()
+    release.set()
 
-    t.join()
+    t1.join()
+    t2.join()
 
-    # Should have waited at least 0.4s (0.5 - 0.1)
-    assert end - start >= 0.3
+    # Thread 2 only got the lock once thread 1 let go of it
+    assert order == ["released", "acquired"]
 
 
 def test_lock_timeout(tmp_path):
     lock_file = tmp_path / "timeout.lock"
     lock1 = FileLock(str(lock_file))
     lock2 = FileLock(str(lock_file), timeout=0.2)
+    acquired = threading.Event()
+    release = threading.Event()
 
-    # Thread 1 holds lock forever (longer than timeout)
+    # Thread 1 holds lock until the timeout has been observed
     def hold_lock():
         with lock1.acquire():
-            time.sleep(1.0)
+            acquired.set()
+            release.wait()
 
     t = threading.Thread(target=hold_lock)
     t.start()
-
-    time.sleep(0.1)
+    acquired.wait()
 
     # Thread 2 tries to acquire and should timeout
-    with pytest.raises(TimeoutError):
-        with lock2.acquire():
+    try:
+        with pytest.raises(TimeoutError):
+            with lock2.acquire():
+                pass
+    finally:
+        release.set()
+        t.join()
+
+
+def test_lock_timeout_restores_alarm_handler(tmp_path):
+    lock_file = tmp_path / "alarm.lock"
+    holder = FileLock(str(lock_file))
+    waiter = FileLock(str(lock_file), timeout=0.2)
+    previous = signal.getsignal(signal.SIGALRM)
+
+    with holder.acquire():
+        with pytest.raises(TimeoutError):
+            with waiter.acquire():
+                pass
+
+    assert signal.getsignal(signal.SIGALRM) is previous
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+
+
+def test_lock_alarm_during_cleanup_restores_handler(tmp_path, monkeypatch):
+    lock_file = tmp_path / "late_alarm.lock"
+    holder = FileLock(str(lock_file))
+    waiter = FileLock(str(lock_file), timeout=0.2)
+    previous = signal.getsignal(signal.SIGALRM)
+    setitimer = signal.setitimer
+    fired = []
+
+    # Simulate the alarm going off just as the cleanup disarms the timer
+    def late_alarm(which, seconds):
+        if seconds == 0 and not fired:
+            fired.append(True)
+            setitimer(which, 0)
+            raise waiter._timeout_error()
+        return setitimer(which, seconds)
+
+    monkeypatch.setattr(signal, "setitimer", late_alarm)
+    with holder.acquire():
+        with pytest.raises(TimeoutError):
+            with waiter.acquire():
+                pass
+
+    assert fired
+    assert signal.getsignal(signal.SIGALRM) is previous
+
+
+def test_lock_timeout_off_main_thread(tmp_path):
+    lock_file = tmp_path / "worker.lock"
+    holder = FileLock(str(lock_file))
+    waiter = FileLock(str(lock_file), timeout=0.2)
+    errors = []
+
+    # Signals only reach the main thread, so workers fall back to polling
+    def try_lock():
+        try:
+            with waiter.acquire():
+                pass
+        except TimeoutError as e:
+            errors.append(e)
+
+    with holder.acquire():
+        t = threading.Thread(target=try_lock)
+        t.start()
+        t.join()
+
+    assert len(errors) == 1
+
+
+def test_lock_reentrant(tmp_path):
+    lock = FileLock(str(tmp_path / "reentrant.lock"), timeout=0.2)
+
+    # Nested acquisition by the holder does not wait on its own flock
+    with lock.acquire():
+        with lock.acquire():
             pass
+        other = FileLock(str(tmp_path / "reentrant.lock"), timeout=0.2)
+        with pytest.raises(TimeoutError):
+            with other.acquire():
+                pass
 
-    t.join()
+    with FileLock(str(tmp_path / "reentrant.lock")).acquire():
+        pass
@@ -25,6 +25,57 @@ def test_persistence(clean_store):
     assert loaded_task.id == task_id
 
 
+def test_persistence_parallel_load(clean_store, monkeypatch):
+    orch = clean_store
+    ids = [orch.add_task(f"Task {i}").id for i in range(5)]
+
+    # A stray file in refs/ is skipped, not fatal, and so is a ref update in flight
+    with open(os.path.join(orch.storage.refs_dir, "not-a-uuid"), "w") as f:
+        f.write("junk")
+    with open(os.path.join(orch.storage.refs_dir, ".tmp-inflight"), "w") as f:
+        f.write(orch.get_task(ids[0]).version_hash)
+
+    # Force the thread-pool path
+    monkeypatch.setattr("src.tracker.PARALLEL_LOAD_THRESHOLD", 1)
+    new_orch = TodoTracker(root_dir=orch.storage.root_dir)
+
+    assert set(new_orch.tasks) == set(ids)
+    for task_id in ids:
+        assert new_orch.get_task(task_id).version_hash == orch.get_task(task_id).version_hash
+
+
+def test_lazy_load(clean_store, monkeypatch):
+    orch = clean_store
+    first = orch.add_task("First")
+
+    new_orch = TodoTracker(root_dir=orch.storage.root_dir)
+    monkeypatch.setattr(new_orch, "_load_state", lambda: pytest.fail("full load"))
+    second = new_orch.add_task("Second")
+    assert new_orch.get_task(first.id).description == "First"
+    assert new_orch.get_task(second.id).version_hash is not None
+    monkeypatch.undo()
+
+    # The first full access loads everything, including tasks added before it
+    assert set(new_orch.tasks) == {first.id, second.id}
+    assert new_orch.get_task(second.id).description == "Second"
+
+
+def test_reload(clean_store):
+    orch = clean_store
+    first = orch.add_task("First")
+    assert set(orch.tasks) == {first.id}
+
+    other = TodoTracker(root_dir=orch.storage.root_dir)
+    second = other.add_task("Second")
+    other.delete_task(first.id)
+
+    # The loaded set is stale until reloaded
+    assert set(orch.tasks) == {first.id}
+    orch.reload()
+    assert set(orch.tasks) == {second.id}
+    assert sum(orch.alias_index.values(), []) == [second.id]
+
+
 def test_history(clean_store):
     orch = clean_store
     task = orch.add_task("Version 1")
@@ -47,6 +98,20 @@ def test_history(clean_store):
     assert history[2].description == "Version 1"
 
 
+def test_version_object_content(clean_store):
+    orch = clean_store
+    task = orch.add_task("Version 1")
+    v2 = orch.update_task(task.id, description="Version 2")
+
+    # The stored object hashes to its version and does not embed any version hash
+    raw = orch.storage.get_object(v2.version_hash)
+    assert hashlib.sha256(raw).hexdigest() == v2.version_hash
+    data = orch.storage.get_json(v2.version_hash)
+    assert "version_hash" not in data
+    assert data["parent"] == task.version_hash
+    assert data["description"] == "Version 2"
+
+
 def test_attachment_deduplication(clean_store, tmp_path):
     orch = clean_store
 
@@ -60,7 +125,7 @@ def test_attachment_deduplication(clean_store, tmp_path):
     task2 = orch.add_task("Task 2")
     orch.add_attachment(task2.id, str(test_file))
 
-    # Check storage
+    # Check storage (objects are sharded by the first two hex chars of the hash)
     objects_dir = os.path.join(orch.storage.root_dir, "objects")
 
     # We expect:
@@ -72,7 +137,7 @@ def test_attachment_deduplication(clean_store, tmp_path):
 
     content_hash = hashlib.sha256(b"Hello World").hexdigest()
 
-    assert os.path.exists(os.path.join(objects_dir, content_hash))
+    assert os.path.exists(os.path.join(objects_dir, content_hash[:2], content_hash[2:]))
 
     # Verify that both tasks point to this hash
     t1 = orch.get_task(task1.id)
@@ -80,3 +145,167 @@ def test_attachment_deduplication(clean_store, tmp_path):
 
     assert t1.attachments[0].content_hash == content_hash
     assert t2.attachments[0].content_hash == content_hash
+
+
+def test_history_reuses_parsed_versions(clean_store, monkeypatch):
+    orch = clean_store
+    task = orch.add_task("Version 1")
+    orch.update_task(task.id, description="Version 2")
+    orch.update_task(task.id, description="Version 3")
+
+    new_orch = TodoTracker(root_dir=orch.storage.root_dir)
+    first = new_orch.get_history(task.id)
+
+    # Once parsed, every version including the head is served from the cache
+    reads = []
+    get_json = new_orch.storage.get_json
+    monkeypatch.setattr(new_orch.storage, "get_json", lambda h: reads.append(h) or get_json(h))
+    second = new_orch.get_history(task.id)
+    assert reads == []
+    assert [t.version_hash for t in second] == [t.version_hash for t in first]
+    assert new_orch.get_task_version(task.id, 1).description == "Version 1"
+
+
+def test_get_task_memoized_per_head(clean_store, monkeypatch):
+    orch = clean_store
+    task = orch.add_task("Version 1")
+
+    new_orch = TodoTracker(root_dir=orch.storage.root_dir)
+    reads = []
+    get_json = new_orch.storage.get_json
+    monkeypatch.setattr(new_orch.storage, "get_json", lambda h: reads.append(h) or get_json(h))
+
+    # Repeated lookups only re-read the ref while the head stays put
+    first = new_orch.get_task(task.id)
+    assert new_orch.get_task(task.id) is first
+    assert reads == [task.version_hash]
+
+    # A commit from another tracker moves the ref, so the new head is read
+    v2 = orch.update_task(task.id, description="Version 2")
+    assert new_orch.get_task(task.id).description == "Version 2"
+    assert reads == [task.version_hash, v2.version_hash]
+
+
+def test_version_cache_is_bounded(clean_store, monkeypatch):
+    monkeypatch.setattr("src.tracker.VERSION_CACHE_SIZE", 2)
+    orch = clean_store
+    task = orch.add_task("Version 1")
+    for i in range(2, 5):
+        orch.update_task(task.id, description=f"Version {i}")
+
+    assert len(orch._version_cache) == 2
+    assert [t.description for t in orch.get_history(task.id)] == [f"Version {i}" for i in range(4, 0, -1)]
+
+
+def test_history_memoized_per_head(clean_store, monkeypatch):
+    orch = clean_store
+    task = orch.add_task("Version 1")
+    orch.update_task(task.id, description="Version 2")
+
+    first = orch.get_history(task.id)
+    monkeypatch.setattr(orch, "_get_version", lambda h: pytest.fail("re-walked history"))
+    assert orch.get_history(task.id) == first
+    monkeypatch.undo()
+
+    # A new commit moves the head, so the next call walks the new chain
+    orch.archive_task(task.id)
+    history = orch.get_history(task.id)
+    assert [t.archived for t in history] == [True, False, False]
+    assert history[1:] == first
+
+
+def test_batch_defers_ref_writes(clean_store):
+    orch = clean_store
+    with orch.batch():
+        task = orch.add_task("Draft")
+        orch.update_task(task.id, description="Final")
+        # Reads inside the batch see the deferred head
+        assert orch.get_task(task.id).description == "Final"
+        assert orch.storage.get_ref(task.id) is None
+
+    head = orch.storage.get_ref(task.id)
+    assert head == orch.get_task(task.id).version_hash
+    new_orch = TodoTracker(root_dir=orch.storage.root_dir)
+    assert [t.description for t in new_orch.get_history(task.id)] == ["Final", "Draft"]
+
+
+def test_batch_flushes_before_full_load(clean_store):
+    orch = clean_store
+    with orch.batch():
+        task = orch.add_task("In batch")
+        assert task.id in orch.tasks
+        assert orch.delete_task(task.id)
+    assert orch.storage.get_ref(task.id) is None
+
+
+def test_batch_update_then_delete(clean_store):
+    orch = clean_store
+    task = orch.add_task("Doomed")
+    assert task.id in orch.tasks
+
+    with orch.batch():
+        orch.update_task(task.id, description="Updated")
+        assert orch.delete_task(task.id)
+
+    assert orch.storage.get_ref(task.id) is None
+    assert TodoTracker(root_dir=orch.storage.root_dir).get_task(task.id) is None
+
+
+def test_batch_writes_completed_operations_on_error(clean_store):
+    orch = clean_store
+    with pytest.raises(RuntimeError):
+        with orch.batch():
+            task = orch.add_task("Before the error")
+            raise RuntimeError("boom")
+
+    assert TodoTracker(root_dir=orch.storage.root_dir).get_task(task.id).description == "Before the error"
+
+
+def test_history_limit(clean_store, monkeypatch):
+    orch = clean_store
+    task = orch.add_task("Version 1")
+    for i in range(2, 5):
+        orch.update_task(task.id, description=f"Version {i}")
+
+    new_orch = TodoTracker(root_dir=orch.storage.root_dir)
+    reads = []
+    get_version = new_orch._get_version
+    monkeypatch.setattr(new_orch, "_get_version", lambda h: reads.append(h) or get_version(h))
+
+    # Only the versions asked for are read
+    assert [t.description for t in new_orch.get_history(task.id, limit=2)] == ["Version 4", "Version 3"]
+    assert len(reads) == 1
+    assert new_orch.get_history(task.id, limit=0) == []
+
+    full = new_orch.get_history(task.id)
+    assert len(full) == 4
+    assert new_orch.get_history(task.id, limit=3) == full[:3]
+
+
+def test_iter_all_history(clean_store):
+    orch = clean_store
+    kept = orch.add_task("Kept v1")
+    orch.update_task(kept.id, description="Kept v2")
+    archived = orch.add_task("Archived v1")
+    orch.archive_task(archived.id)
+
+    new_orch = TodoTracker(root_dir=orch.storage.root_dir)
+    histories = dict(new_orch.iter_all_history())
+    assert set(histories) == {kept.id, archived.id}
+    for task_id, history in histories.items():
+        assert history == orch.get_history(task_id)
+
+    assert [task_id for task_id, _ in new_orch.iter_all_history(include_archived=False)] == [kept.id]
+
+
+def test_iter_all_history_skips_history_memo(clean_store):
+    orch = clean_store
+    task = orch.add_task("v1")
+    orch.update_task(task.id, description="v2")
+
+    new_orch = TodoTracker(root_dir=orch.storage.root_dir)
+    histories = dict(new_orch.iter_all_history())
+
+    # A full export must not pin every history in the get_history memo
+    assert [t.description for t in histories[task.id]] == ["v2", "v1"]
+    assert len(new_orch._history_cache) == 0
@@ -3,6 +3,7 @@ from src.storage import ObjectStore
 from uuid import uuid4
 import os
 import json
+import hashlib
 
 
 @pytest.fixture
@@ -54,6 +55,83 @@ class TestStorageEdgeCases:
         assert retrieved == large_data
         assert len(retrieved) == 1024 * 1024
 
+    def test_store_blob_short_reads_and_writes(self, storage, monkeypatch):
+        """Test that partial os.read/os.write calls still round-trip the whole blob."""
+        data = bytes(range(256)) * 4
+        read, write = os.read, os.write
+        monkeypatch.setattr(os, "read", lambda fd, n: read(fd, min(n, 100)))
+        monkeypatch.setattr(os, "write", lambda fd, b: write(fd, b[:100]))
+
+        content_hash = storage.store_blob(data)
+        assert storage.get_object(content_hash) == data
+
+    def test_store_blob_failed_write_leaves_no_object(self, storage, monkeypatch):
+        """Test that a write failing midway leaves no object or temp file, so a retry stores it."""
+        data = b"x" * 1000
+        write = os.write
+
+        def fail_after_first_chunk(fd, b):
+            if len(b) < len(data):
+                raise OSError(28, "No space left on device")
+            return write(fd, b[:100])
+
+        monkeypatch.setattr(os, "write", fail_after_first_chunk)
+        with pytest.raises(OSError):
+            storage.store_blob(data)
+        monkeypatch.setattr(os, "write", write)
+
+        content_hash = storage._compute_hash(data)
+        assert storage.get_object(content_hash) is None
+        assert [name for name in os.listdir(storage.objects_dir) if name.startswith(".tmp-")] == []
+        assert storage.store_blob(data) == content_hash
+        assert storage.get_object(content_hash) == data
+
+    def test_store_blob_publishes_only_complete_objects(self, storage, monkeypatch):
+        """Test that the object path only appears once every byte is written."""
+        data = bytes(range(256)) * 4
+        path = storage._writable_path(storage._compute_hash(data))
+        write = os.write
+        seen = []
+
+        def short_write(fd, b):
+            seen.append(os.path.exists(path))
+            return write(fd, b[:100])
+
+        monkeypatch.setattr(os, "write", short_write)
+        storage.store_blob(data)
+
+        assert seen and not any(seen)
+        assert storage.get_object(storage._compute_hash(data)) == data
+
+    def test_store_blob_concurrent_writer_wins(self, storage, monkeypatch):
+        """Test that a writer finishing first is kept and the loser cleans up its temp file."""
+        data = b"same bytes from two writers"
+        content_hash = storage._compute_hash(data)
+        link = os.link
+
+        def other_writer_first(src, dst):
+            with open(dst, "wb") as f:
+                f.write(data)
+            return link(src, dst)
+
+        monkeypatch.setattr(os, "link", other_writer_first)
+        assert storage.store_blob(data) == content_hash
+
+        assert storage.get_object(content_hash) == data
+        assert os.listdir(storage.objects_dir) == [content_hash[:2]]
+
+    def test_store_blob_without_hard_links(self, storage, monkeypatch):
+        """Test that objects are still stored on filesystems that refuse hard links."""
+
+        def no_links(src, dst):
+            raise PermissionError(1, "Operation not permitted")
+
+        monkeypatch.setattr(os, "link", no_links)
+        content_hash = storage.store_blob(b"no links here")
+
+        assert storage.get_object(content_hash) == b"no links here"
+        assert os.listdir(storage.objects_dir) == [content_hash[:2]]
+
     def test_store_duplicate_blob(self, storage):
         """Test that storing the same blob twice returns same hash."""
         data = b"test content"
@@ -63,8 +141,93 @@ class TestStorageEdgeCases:
         assert hash1 == hash2
 
         # Verify only one file exists
-        object_path = os.path.join(storage.objects_dir, hash1)
+        object_path = os.path.join(storage.objects_dir, hash1[:2], hash1[2:])
         assert os.path.exists(object_path)
+        assert os.listdir(os.path.dirname(object_path)) == [hash1[2:]]
+
+    def test_store_blob_from_path(self, storage, tmp_path, monkeypatch):
+        """Test that streaming a file stores the same object as store_blob."""
+        data = bytes(range(256)) * 100
+        source = tmp_path / "source.bin"
+        source.write_bytes(data)
+
+        # Small chunks so the file is streamed in several pieces
+        monkeypatch.setattr("src.storage.CHUNK_SIZE", 1000)
+        content_hash = storage.store_blob_from_path(str(source))
+
+        assert content_hash == storage._compute_hash(data)
+        assert storage.get_object(content_hash) == data
+
+        # Storing it again deduplicates and leaves no temp files behind
+        assert storage.store_blob_from_path(str(source)) == content_hash
+        assert os.listdir(storage.objects_dir) == [content_hash[:2]]
+
+    def test_store_blob_from_file(self, storage, monkeypatch):
+        """Test that streaming any binary file object stores the same object as store_blob."""
+        import io
+
+        data = bytes(range(256)) * 100
+        monkeypatch.setattr("src.storage.CHUNK_SIZE", 1000)
+        content_hash = storage.store_blob_from_file(io.BytesIO(data))
+
+        assert content_hash == storage.store_blob(data)
+        assert storage.get_object(content_hash) == data
+        assert os.listdir(storage.objects_dir) == [content_hash[:2]]
+
+    def test_store_blob_from_missing_path(self, storage):
+        """Test that streaming a missing file raises and leaves no temp files."""
+        with pytest.raises(FileNotFoundError):
+            storage.store_blob_from_path("/nonexistent/file.txt")
+        assert os.listdir(storage.objects_dir) == []
+
+    def test_store_existing_object_not_rewritten(self, storage):
+        """Test that storing an object that already exists skips the write."""
+        content_hash = storage.store_blob(b"dedup me")
+        object_path = storage._path_for(content_hash)
+        mtime = os.stat(object_path).st_mtime_ns
+
+        assert storage.store_blob(b"dedup me") == content_hash
+        assert os.stat(object_path).st_mtime_ns == mtime
+
+    def test_objects_sharded_by_hash_prefix(self, storage):
+        """Test that objects live under objects/<first 2 hex chars>/<rest>."""
+        content_hash = storage.store_blob(b"sharded")
+        assert storage._path_for(content_hash) == os.path.join(storage.objects_dir, content_hash[:2], content_hash[2:])
+        assert os.path.isfile(storage._path_for(content_hash))
+
+    def test_legacy_flat_objects_migrated(self, tmp_path):
+        """Test that objects stored flat under objects/ are moved into shards."""
+        store_path = tmp_path / "legacy_store"
+        ObjectStore(root_dir=str(store_path))
+
+        data = b"legacy object"
+        content_hash = hashlib.sha256(data).hexdigest()
+        (store_path / "objects" / content_hash).write_bytes(data)
+
+        storage = ObjectStore(root_dir=str(store_path))
+        assert storage.get_object(content_hash) == data
+        assert not (store_path / "objects" / content_hash).exists()
+
+    def test_legacy_migration_races_another_process(self, tmp_path, monkeypatch):
+        """Test that a flat object moved by a concurrent migration is treated as migrated."""
+        store_path = tmp_path / "legacy_store"
+        ObjectStore(root_dir=str(store_path))
+
+        data = b"legacy object"
+        content_hash = hashlib.sha256(data).hexdigest()
+        (store_path / "objects" / content_hash).write_bytes(data)
+
+        replace = os.replace
+
+        def racing_replace(src, dst):
+            # The other process migrates the object between our scan and our move
+            monkeypatch.setattr(os, "replace", replace)
+            ObjectStore(root_dir=str(store_path))
+            replace(src, dst)
+
+        monkeypatch.setattr(os, "replace", racing_replace)
+        storage = ObjectStore(root_dir=str(store_path))
+        assert storage.get_object(content_hash) == data
 
     def test_store_empty_json(self, storage):
         """Test storing an empty JSON object."""
@@ -124,6 +287,15 @@ class TestStorageEdgeCases:
         storage.update_ref(task_id, hash3)
         assert storage.get_ref(task_id) == hash3
 
+    def test_get_ref_longer_than_read_size(self, storage, monkeypatch):
+        """Test that a ref spanning several reads is returned whole."""
+        task_id = uuid4()
+        content_hash = hashlib.sha256(b"ref").hexdigest()
+        storage.update_ref(task_id, content_hash)
+
+        monkeypatch.setattr("src.storage.REF_READ_SIZE", 16)
+        assert storage.get_ref(task_id) == content_hash
+
     def test_get_json_corrupted_data(self, storage):
         """Test getting JSON when the stored data is corrupted."""
         # Store valid blob
@@ -200,6 +372,22 @@ class TestStorageEdgeCases:
 
         assert content == test_hash
 
+    def test_update_ref_replaces_atomically(self, storage, monkeypatch):
+        """Test that a failed ref update keeps the old head and leaves no temp files."""
+        task_id = uuid4()
+        storage.update_ref(task_id, "hash1")
+        assert os.listdir(storage.refs_dir) == [str(task_id)]
+
+        def fail(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", fail)
+        with pytest.raises(OSError):
+            storage.update_ref(task_id, "hash2")
+
+        assert storage.get_ref(task_id) == "hash1"
+        assert os.listdir(storage.refs_dir) == [str(task_id)]
+
     def test_store_json_with_datetime(self, storage):
         """Test storing JSON with datetime objects (should be converted to string)."""
         from datetime import datetime
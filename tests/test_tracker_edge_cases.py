@@ -96,6 +96,27 @@ class TestAttachmentEdgeCases:
         assert result is True
         assert output.read_text() == "original content"
 
+    def test_extract_empty_attachment(self, tracker, tmp_path):
+        """Test that an empty attachment extracts to an empty file."""
+        task = tracker.add_task("Test task")
+        test_file = tmp_path / "empty.txt"
+        test_file.write_bytes(b"")
+        tracker.add_attachment(task.id, str(test_file))
+
+        output = tmp_path / "output.txt"
+        assert tracker.extract_attachment(task.id, "empty.txt", str(output)) is True
+        assert output.read_bytes() == b""
+
+    def test_extract_attachment_to_missing_directory(self, tracker, tmp_path):
+        """Test extracting into a directory that doesn't exist."""
+        task = tracker.add_task("Test task")
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("content")
+        tracker.add_attachment(task.id, str(test_file))
+
+        output = tmp_path / "missing" / "output.txt"
+        assert tracker.extract_attachment(task.id, "test.txt", str(output)) is False
+
     def test_add_multiple_attachments_same_name(self, tracker, tmp_path):
         """Test adding multiple attachments with the same filename."""
         task = tracker.add_task("Test task")